@@ -7,7 +7,7 @@ Agents module - 에이전트 모듈
 """
 
 # Domain expert agent
-from .divorce_case_domain_expert import divorce_case_agent
+from .divorce_case_domain_expert import DIVORCE_TOOLS, divorce_case_agent
 
 # Domain router and registry
 from .registry import AGENT_REGISTRY, AgentInfo, get_active_agents, get_agent_info
@@ -15,6 +15,7 @@ from .registry import AGENT_REGISTRY, AgentInfo, get_active_agents, get_agent_in
 __all__ = [
     # Main Unified Agent
     "divorce_case_agent",
+    "DIVORCE_TOOLS",
     # Registry
     "AGENT_REGISTRY",
     "AgentInfo",
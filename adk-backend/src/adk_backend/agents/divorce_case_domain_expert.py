@@ -24,6 +24,22 @@ from ..tools.bigquery import (
 
 settings = get_settings()
 
+# FunctionTool은 생성 시 함수 시그니처를 분석하므로 한 번만 감싸서 다른 에이전트와 공유
+DIVORCE_TOOLS: tuple = tuple(
+    FunctionTool(fn)
+    for fn in (
+        analyze_divorce_evidence,
+        analyze_multiple_divorce_evidence,
+        check_evidence_legality,
+        auto_match_precedents_from_image,
+        search_precedents,
+        ask_data_insights,
+        bigquery_execute,
+        bigquery_dry_run,
+        bigquery_list_templates,
+    )
+)
+
 divorce_case_agent = Agent(
     name="divorce_total_expert",
     description="통합 이혼 솔루션 에이전트 - 멀티모달 증거 분석, 판례 RAG, 자연어 데이터 통계 및 전문가 상담 가이드 제공",
@@ -57,15 +73,5 @@ divorce_case_agent = Agent(
         "- 파일 경로(이미지 등)가 보이면 즉시 증거 분석 도구를 호출하세요.\n"
         "- 궁금한 통계 수치는 `ask_data_insights` 또는 BigQuery 도구를 활용하세요."
     ),
-    tools=[
-        FunctionTool(analyze_divorce_evidence),
-        FunctionTool(analyze_multiple_divorce_evidence),
-        FunctionTool(check_evidence_legality),
-        FunctionTool(auto_match_precedents_from_image),
-        FunctionTool(search_precedents),
-        FunctionTool(ask_data_insights),
-        FunctionTool(bigquery_execute),
-        FunctionTool(bigquery_dry_run),
-        FunctionTool(bigquery_list_templates),
-    ],
+    tools=list(DIVORCE_TOOLS),
 )
@@ -4,32 +4,85 @@
 """
 
 import logging
-from typing import List, Optional, Annotated
+import os
+import uuid
+from collections import defaultdict, deque
+from itertools import islice
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Annotated
 
+import aiofiles
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
 from fastapi.responses import StreamingResponse
 
 from .schemas.chat import (
-    QueryRequest, QueryResponse, AgentSummary, ExampleQuery, 
+    QueryRequest, QueryResponse, AgentSummary, ExampleQuery, InterpretRequest,
     UploadResponse, FeedbackRequest, FeedbackResponse, HistoryResponse
 )
 from ..services.chat_service import (
     process_query_service, 
     stream_adk_events_service
 )
+from .responses import DEFAULT_RESPONSE_CLASS
 from ..agents import AGENT_REGISTRY, get_agent_info
-from ..utils.bigquery_helper import BigQueryHelper
+from ..live import coalesce_sse_frames, format_sse_message
+from ..nlp.ai_client import get_ai_client
+from ..utils.bigquery_helper import BigQueryHelper, get_bigquery_helper
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/chat", tags=["chat"])
+router = APIRouter(prefix="/chat", tags=["chat"], default_response_class=DEFAULT_RESPONSE_CLASS)
+
+# 업로드 저장 경로 (app.py의 /uploads 정적 마운트와 동일)
+UPLOAD_DIR = os.path.join(os.getcwd(), "data", "uploads")
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+
+# SSE 응답 헤더 (읽기 전용으로 공유)
+_SSE_HEADERS: Mapping[str, str] = MappingProxyType({
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+    "Connection": "keep-alive",
+})
 
 # In-memory stores for demo purposes
-CHAT_HISTORY = {}
+MAX_HISTORY_PER_USER = 500
+# 사용자별로 시간순 append만 하므로 최신 N개는 정렬 없이 뒤에서부터 꺼냄
+CHAT_HISTORY: "defaultdict[str, deque]" = defaultdict(lambda: deque(maxlen=MAX_HISTORY_PER_USER))
 FEEDBACK_STORE = []
 
-def get_bigquery_helper() -> BigQueryHelper:
-    """BigQuery 헬퍼 인스턴스 반환"""
-    return BigQueryHelper()
+# AGENT_REGISTRY는 import 시점에 고정되므로 요약 목록도 한 번만 생성
+_AGENT_SUMMARIES: List[AgentSummary] = [
+    AgentSummary(
+        key=info.key,
+        display_name=info.display_name,
+        description=info.description,
+        focus=info.focus,
+        strengths=info.strengths,
+        keywords=info.keywords,
+        active=info.active,
+    )
+    for info in AGENT_REGISTRY.values()
+]
+
+_EXAMPLE_QUERIES: List[ExampleQuery] = [
+    ExampleQuery(
+        id="divorce_evidence",
+        category="증거 분석",
+        question="제가 제출한 카톡 대화 내용이 이혼 소송에서 증거로 사용될 수 있을까요?",
+        description="제출된 증거의 법적 효력과 의미를 분석합니다"
+    ),
+    ExampleQuery(
+        id="precedent_alimony",
+        category="판례 통계",
+        question="최근 3년간 서울가정법원의 평균 위자료 액수는 얼마인가요?",
+        description="BigQuery 판례 데이터를 기반으로 위자료 통계를 제공합니다"
+    ),
+    ExampleQuery(
+        id="legal_division",
+        category="재산 분할",
+        question="결혼 전 취득한 특유재산도 재산 분할 대상에 포함되나요?",
+        description="재산 분할 원칙과 예외 상황에 대해 상담합니다"
+    )
+]
 
 @router.post("/query", response_model=QueryResponse)
 async def process_query(
@@ -39,91 +92,79 @@ async def process_query(
     """사용자 질의 처리 엔드포인트"""
     return await process_query_service(request, bq_helper)
 
+def _stream_query_events(request: QueryRequest):
+    """통합 에이전트의 ADK 이벤트 스트림 생성"""
+    agent_info = get_agent_info("divorce_case")
+    return stream_adk_events_service(
+        executor_agent_info=agent_info,
+        display_agent_info=agent_info,
+        agent_mode="unified",
+        user_message=request.message,
+        user_id=request.user_id or "anonymous",
+        session_id=request.session_id or "default"
+    )
+
 @router.post("/query-stream")
 async def process_query_stream(
     request: QueryRequest,
     bq_helper: BigQueryHelper = Depends(get_bigquery_helper)
 ):
-    """사용자 질의 실시간 스트리밍 엔드포인트"""
-    agent_info = get_agent_info("divorce_case")
-    
+    """사용자 질의 실시간 스트리밍 엔드포인트
+
+    짧은 시간 안에 나온 SSE 프레임은 한 청크로 묶어 전송하고, 유휴 시 keepalive 프레임을 보냅니다.
+    """
     return StreamingResponse(
-        stream_adk_events_service(
-            executor_agent_info=agent_info,
-            display_agent_info=agent_info,
-            agent_mode="unified",
-            user_message=request.message,
-            user_id=request.user_id or "anonymous",
-            session_id=request.session_id or "default"
-        ),
+        coalesce_sse_frames(_stream_query_events(request)),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-            "Connection": "keep-alive",
-        }
+        headers=_SSE_HEADERS,
+    )
+
+@router.post("/interpret-stream")
+async def interpret_result_stream(request: InterpretRequest):
+    """쿼리 결과 해석을 생성되는 대로 SSE로 스트리밍 (interpretation.delta 조각 후 interpretation.done)"""
+    ai_client = get_ai_client()
+
+    async def sse():
+        async for text in ai_client.stream_interpret_result(request.query, request.sql, request.result):
+            yield format_sse_message({"event": "interpretation.delta", "data": {"text": text}})
+        yield format_sse_message({"event": "interpretation.done", "data": {}})
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
     )
 
 @router.get("/agents", response_model=List[AgentSummary])
 async def list_agents() -> List[AgentSummary]:
     """사용 가능한 에이전트 목록 조회"""
-    summaries = []
-    for info in AGENT_REGISTRY.values():
-        summaries.append(
-            AgentSummary(
-                key=info.key,
-                display_name=info.display_name,
-                description=info.description,
-                focus=info.focus,
-                strengths=info.strengths,
-                keywords=info.keywords,
-                active=info.active,
-            )
-        )
-    return summaries
+    return _AGENT_SUMMARIES
 
 @router.get("/examples", response_model=List[ExampleQuery])
 async def get_example_queries() -> List[ExampleQuery]:
     """예시 질의 목록 조회"""
-    return [
-        ExampleQuery(
-            id="divorce_evidence",
-            category="증거 분석",
-            question="제가 제출한 카톡 대화 내용이 이혼 소송에서 증거로 사용될 수 있을까요?",
-            description="제출된 증거의 법적 효력과 의미를 분석합니다"
-        ),
-        ExampleQuery(
-            id="precedent_alimony",
-            category="판례 통계",
-            question="최근 3년간 서울가정법원의 평균 위자료 액수는 얼마인가요?",
-            description="BigQuery 판례 데이터를 기반으로 위자료 통계를 제공합니다"
-        ),
-        ExampleQuery(
-            id="legal_division",
-            category="재산 분할",
-            question="결혼 전 취득한 특유재산도 재산 분할 대상에 포함되나요?",
-            description="재산 분할 원칙과 예외 상황에 대해 상담합니다"
-        )
-    ]
+    return _EXAMPLE_QUERIES
 
 @router.post("/upload", response_model=UploadResponse)
 async def upload_file(file: UploadFile = File(...)):
     """파일 업로드 처리"""
-    import os, uuid, shutil
     try:
-        upload_dir = os.path.join(os.getcwd(), "data", "uploads")
-        os.makedirs(upload_dir, exist_ok=True)
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
         unique_filename = f"{uuid.uuid4()}{os.path.splitext(file.filename)[1]}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
+        file_path = os.path.join(UPLOAD_DIR, unique_filename)
+
+        # 이벤트 루프를 막지 않도록 청크 단위로 비동기 기록
+        size = 0
+        async with aiofiles.open(file_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await out.write(chunk)
+                size += len(chunk)
+
         return UploadResponse(
             file_path=file_path,
             filename=file.filename,
             content_type=file.content_type or "application/octet-stream",
-            size=os.path.getsize(file_path),
+            size=size,
             file_url=f"/uploads/{unique_filename}"
         )
     except Exception as e:
@@ -132,9 +173,10 @@ async def upload_file(file: UploadFile = File(...)):
 @router.get("/history/{user_id}", response_model=HistoryResponse)
 async def get_chat_history(user_id: str, limit: int = 10):
     """채팅 내역 조회"""
-    user_msgs = CHAT_HISTORY.get(user_id, [])
-    user_msgs.sort(key=lambda x: getattr(x, 'timestamp', 0), reverse=True)
-    return HistoryResponse(messages=user_msgs[:limit])
+    user_msgs = CHAT_HISTORY.get(user_id)
+    if not user_msgs:
+        return HistoryResponse(messages=[])
+    return HistoryResponse(messages=list(islice(reversed(user_msgs), limit)))
 
 @router.post("/feedback", response_model=FeedbackResponse)
 async def submit_feedback(feedback: FeedbackRequest):
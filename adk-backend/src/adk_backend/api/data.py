@@ -8,12 +8,19 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
 import logging
 from datetime import datetime
+from time import perf_counter
 
-from ..utils.bigquery_helper import BigQueryHelper
+from .responses import DEFAULT_RESPONSE_CLASS, orjson_response
+from ..utils.bigquery_helper import BigQueryHelper, get_bigquery_helper
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/data", tags=["data"])
+router = APIRouter(prefix="/data", tags=["data"], default_response_class=DEFAULT_RESPONSE_CLASS)
+
+# 이 행 수를 넘는 쿼리 결과는 Pydantic 모델을 거치지 않고 orjson으로 바로 응답
+RAW_RESPONSE_MIN_ROWS = 1000
+# /execute 로 실행되는 임의 쿼리의 스캔량 상한 (10GB)
+QUERY_MAX_BYTES_BILLED = 10 * 1024 ** 3
 
 # Pydantic 모델들
 class TableInfo(BaseModel):
@@ -46,10 +53,59 @@ class QueryExecutionResponse(BaseModel):
     error: Optional[str] = None
     query_info: Optional[Dict[str, Any]] = None
 
-# 의존성 주입
-def get_bigquery_helper() -> BigQueryHelper:
-    """BigQuery 헬퍼 인스턴스 반환"""
-    return BigQueryHelper()
+# 이혼 도메인 관련 주요 테이블 정의
+_DATA_SOURCE_DEFINITIONS: tuple = (
+    {
+        "name": "precedent_cases",
+        "display_name": "🏛️ 전국 이혼 판례 데이터",
+        "description": "과거 이혼 판결 통계, 위자료/재산분할 액수, 양육권 판결 결과",
+        "tables": ("precedent_cases",)
+    },
+    {
+        "name": "divorce_evidence_templates",
+        "display_name": "� 이혼 증거 서식 및 가이드",
+        "description": "소장 작성 예시, 합법적 증거 수집 가이드 및 서식 데이터",
+        "tables": ("divorce_evidence_templates",)
+    },
+    {
+        "name": "counseling_knowledge_base",
+        "display_name": "📚 전문 상담 지식베이스",
+        "description": "가사 소송 관련 FAQ, 법률 용어 사전, 절차 안내 정보",
+        "tables": ("knowledge_base",)
+    }
+)
+_DEFINED_TABLES: frozenset = frozenset(
+    table for d in _DATA_SOURCE_DEFINITIONS for table in d["tables"]
+)
+
+def _is_select(sql: str) -> bool:
+    """선행 공백/주석을 건너뛴 첫 키워드가 SELECT인지 확인 (전체 문자열 upper() 없이)"""
+    i, n = 0, len(sql)
+    while i < n and sql[i].isspace():
+        i += 1
+    # -- 한 줄 주석과 /* 블록 주석 */ 건너뛰기
+    while sql.startswith(("--", "/*"), i):
+        if sql[i] == "-":
+            j = sql.find("\n", i)
+            i = n if j < 0 else j + 1
+        else:
+            j = sql.find("*/", i + 2)
+            i = n if j < 0 else j + 2
+        while i < n and sql[i].isspace():
+            i += 1
+    return sql[i:i + 6].lower() == "select" and not sql[i + 6:i + 7].isalnum()
+
+def _parse_ts(timestamp_str: Optional[str]) -> Optional[datetime]:
+    """BigQuery 메타데이터의 ISO 8601 타임스탬프 파싱 (잘못된 값은 None)"""
+    if not timestamp_str:
+        return None
+    # BigQueryHelper는 isoformat()(+00:00)을 반환하므로 'Z' 치환은 필요한 경우에만 수행
+    if timestamp_str[-1] == "Z":
+        timestamp_str = timestamp_str[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        return None
 
 @router.get("/sources", response_model=List[DataSource])
 async def get_data_sources(
@@ -63,51 +119,28 @@ async def get_data_sources(
     """
     try:
         logger.info("Retrieving data sources")
-        
+        bq_helper.reset_error_state()
+
         table_map = {table["name"]: table for table in bq_helper.list_tables()}
+        # 테이블별 get_table_info 호출 대신 메타데이터를 한 번에 조회
+        all_table_info = bq_helper.get_all_table_info()
 
-        # 이혼 도메인 관련 주요 테이블 정의
-        definitions = [
-            {
-                "name": "precedent_cases",
-                "display_name": "🏛️ 전국 이혼 판례 데이터",
-                "description": "과거 이혼 판결 통계, 위자료/재산분할 액수, 양육권 판결 결과",
-                "tables": ["precedent_cases"]
-            },
-            {
-                "name": "divorce_evidence_templates",
-                "display_name": "� 이혼 증거 서식 및 가이드",
-                "description": "소장 작성 예시, 합법적 증거 수집 가이드 및 서식 데이터",
-                "tables": ["divorce_evidence_templates"]
-            },
-            {
-                "name": "counseling_knowledge_base",
-                "display_name": "📚 전문 상담 지식베이스",
-                "description": "가사 소송 관련 FAQ, 법률 용어 사전, 절차 안내 정보",
-                "tables": ["knowledge_base"]
-            }
-        ]
 
         data_sources: List[DataSource] = []
 
-        for definition in definitions:
+        for definition in _DATA_SOURCE_DEFINITIONS:
             total_rows = 0
             last_updated: Optional[datetime] = None
             available_tables = 0
 
             for table_name in definition["tables"]:
-                table_info = bq_helper.get_table_info(table_name)
+                table_info = all_table_info.get(table_name)
                 if table_info:
                     available_tables += 1
                     total_rows += table_info.get("num_rows", 0)
-                    timestamp_str = table_info.get("modified") or table_info.get("created")
-                    if timestamp_str:
-                        try:
-                            timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                        except ValueError:
-                            timestamp = None
-                        if timestamp and (last_updated is None or timestamp > last_updated):
-                            last_updated = timestamp
+                    timestamp = _parse_ts(table_info.get("modified") or table_info.get("created"))
+                    if timestamp and (last_updated is None or timestamp > last_updated):
+                        last_updated = timestamp
 
             permission_error = bq_helper.permission_error
             status = "active" if available_tables > 0 else ("error" if permission_error else "inactive")
@@ -127,20 +160,14 @@ async def get_data_sources(
             )
 
         # 존재하는데 정의되지 않은 테이블도 노출
-        defined_tables = {table for d in definitions for table in d["tables"]}
         for table_name, table_info in table_map.items():
-            if table_name in defined_tables:
+            if table_name in _DEFINED_TABLES:
                 continue
-            metadata = bq_helper.get_table_info(table_name) or {}
+            # __TABLES__ 조회가 실패했으면 list_tables() 결과로 대체 (추가 API 호출 없음)
+            metadata = all_table_info.get(table_name) or table_info
             permission_error = bq_helper.permission_error
             error_message = bq_helper.last_error if permission_error else None
-            timestamp_str = metadata.get("modified") or metadata.get("created")
-            last_updated = None
-            if timestamp_str:
-                try:
-                    last_updated = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                except ValueError:
-                    last_updated = None
+            last_updated = _parse_ts(metadata.get("modified") or metadata.get("created"))
 
             data_sources.append(
                 DataSource(
@@ -148,7 +175,7 @@ async def get_data_sources(
                     display_name=table_name,
                     description=f"{table_name} 테이블",
                     table_count=1,
-                    total_rows=metadata.get("num_rows", 0),
+                    total_rows=metadata.get("num_rows") or 0,
                     last_updated=last_updated,
                     status="error" if permission_error else "active",
                     error=error_message
@@ -188,14 +215,14 @@ async def get_tables(
             if not table_name:
                 continue
             try:
-                table_info = bq_helper.get_table_info(table_name) or {}
+                # 스키마 조회 결과에 행 수/설명/수정 시각이 포함되므로 get_table_info는 호출하지 않음
                 schema_info = bq_helper.get_table_schema(table_name) or {}
                 
                 table_infos.append(TableInfo(
                     table_name=table_name,
-                    description=table_info.get("description") or f"{table_name} 테이블",
-                    row_count=table_info.get('num_rows'),
-                    last_modified=datetime.fromisoformat(table_info["modified"].replace("Z", "+00:00")) if table_info.get("modified") else None,
+                    description=schema_info.get("description") or f"{table_name} 테이블",
+                    row_count=schema_info.get('num_rows'),
+                    last_modified=_parse_ts(schema_info.get("modified")),
                     table_schema=schema_info.get("columns") if schema_info else None
                 ))
                 
@@ -274,15 +301,8 @@ async def get_table_sample(
     try:
         logger.info(f"Retrieving sample data for table: {table_name}")
         
-        # 샘플 쿼리 생성
-        sql_query = f"""
-        SELECT *
-        FROM `{bq_helper.project_id}.{bq_helper.dataset_name}.{table_name}`
-        LIMIT {limit}
-        """
-        
-        # 쿼리 실행
-        results = bq_helper.execute_query(sql_query)
+        # 쿼리 잡 없이 tabledata.list로 앞쪽 행만 조회
+        results = bq_helper.list_rows(table_name, limit)
         
         return {
             "table_name": table_name,
@@ -312,13 +332,13 @@ async def execute_sql_query(
     Returns:
         QueryExecutionResponse: 쿼리 실행 결과
     """
+    # except 블록에서도 참조하므로 try 밖에서 가장 먼저 시작
+    start_time = perf_counter()
     try:
-        start_time = datetime.now()
-        
         logger.info(f"Executing SQL query: {request.sql_query[:100]}...")
         
         # 쿼리 검증 (기본적인 보안 체크)
-        if not request.sql_query.strip().upper().startswith('SELECT'):
+        if not _is_select(request.sql_query):
             raise HTTPException(
                 status_code=400,
                 detail="SELECT 쿼리만 실행할 수 있습니다."
@@ -335,14 +355,26 @@ async def execute_sql_query(
                 query_info={"dry_run": True, "query_valid": True}
             )
         
-        # 쿼리 실행
-        results = bq_helper.execute_query(request.sql_query)
-        
-        # 결과 제한
-        if len(results) > request.max_results:
-            results = results[:request.max_results]
+        # 쿼리는 손대지 않고 결과 행 수만 제한 (필요한 행만 전송받음)
+        results = bq_helper.execute_query(
+            request.sql_query,
+            maximum_bytes_billed=QUERY_MAX_BYTES_BILLED,
+            max_results=request.max_results,
+        )
         
-        execution_time = (datetime.now() - start_time).total_seconds()
+        execution_time = perf_counter() - start_time
+
+        if len(results) > RAW_RESPONSE_MIN_ROWS:
+            return orjson_response({
+                "success": True,
+                "data": results,
+                "row_count": len(results),
+                "execution_time": execution_time,
+                "error": None,
+                "query_info": {
+                    "max_results_applied": len(results) >= request.max_results
+                },
+            })
         
         return QueryExecutionResponse(
             success=True,
@@ -350,7 +382,7 @@ async def execute_sql_query(
             row_count=len(results),
             execution_time=execution_time,
             query_info={
-                "max_results_applied": len(results) == request.max_results
+                "max_results_applied": len(results) >= request.max_results
             }
         )
         
@@ -361,7 +393,7 @@ async def execute_sql_query(
         return QueryExecutionResponse(
             success=False,
             error=str(e),
-            execution_time=(datetime.now() - start_time).total_seconds()
+            execution_time=perf_counter() - start_time
         )
 
 @router.get("/stats")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+JSON 응답 헬퍼
+"""
+
+from decimal import Decimal
+from typing import Any, Type
+
+import orjson
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+# FastAPI 최신 버전은 response_model을 Pydantic으로 직접 bytes 직렬화하므로
+# ORJSONResponse가 deprecated 처리됨 -> 그 경우에는 기본 JSONResponse가 더 빠름
+DEFAULT_RESPONSE_CLASS: Type[JSONResponse] = (
+    JSONResponse if hasattr(ORJSONResponse, "__deprecated__") else ORJSONResponse
+)
+
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(value: Any) -> Any:
+    """orjson이 직접 처리하지 못하는 BigQuery 값 변환 (NUMERIC 등)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def orjson_response(content: Any, status_code: int = 200) -> Response:
+    """Pydantic 모델 생성/검증 없이 orjson으로 바로 인코딩한 JSON 응답"""
+    return Response(
+        content=orjson.dumps(content, default=_orjson_default, option=_ORJSON_OPTIONS),
+        status_code=status_code,
+        media_type="application/json",
+    )
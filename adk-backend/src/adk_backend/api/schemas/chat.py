@@ -51,6 +51,11 @@ class QueryResponse(BaseModel):
     execution_trace: List[Dict[str, Any]] = Field(default_factory=list)
     sql_generation_details: Optional[Dict[str, Any]] = None
 
+class InterpretRequest(BaseModel):
+    query: str = Field(min_length=1)
+    sql: str
+    result: List[Dict[str, Any]] = Field(default_factory=list)
+
 class ExampleQuery(BaseModel):
     id: str
     category: str
@@ -3,16 +3,25 @@
 시스템 상태 및 헬스체크 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable, Union
+from functools import lru_cache, wraps
+import hashlib
 import logging
 import os
-import psutil
+import platform
+import sys
+import time
 from datetime import datetime
+
+import orjson
 import asyncio
 
-from ..utils.bigquery_helper import BigQueryHelper
+from .responses import orjson_response
+from ..utils.bigquery_helper import BigQueryHelper, get_bigquery_helper
+from ..utils.cpu_sampler import cpu_sampler
+from ..utils.linux_proc import IS_LINUX, read_meminfo
 from ..nlp.ai_client import get_ai_client
 
 logger = logging.getLogger(__name__)
@@ -43,182 +52,329 @@ class ServiceStatus(BaseModel):
     last_check: datetime
     error_message: Optional[str] = None
 
-# 시스템 시작 시간
-START_TIME = datetime.now()
+# 시스템 시작 시각 (업타임 계산용, monotonic)
+START_TIME = time.monotonic()
+
+# 응답 캐시 TTL (초): 정상 상태는 길게, 실패 상태는 빨리 재확인
+HEALTHY_CACHE_TTL = 27.0
+UNHEALTHY_CACHE_TTL = 9.0
+STATUS_CACHE_TTL = 5.0
+
+# 엔드포인트별 응답 캐시: key -> (만료 시각(monotonic), 값)
+_response_cache: Dict[str, Tuple[float, Any]] = {}
+# 진행 중인 계산: key -> Task (동시 캐시 미스는 같은 Task 결과를 함께 기다림)
+_inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+async def _compute_and_store(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: Union[float, Callable[[Any], float]],
+) -> Any:
+    value = await compute()
+    expires_in = ttl(value) if callable(ttl) else ttl
+    _response_cache[key] = (time.monotonic() + expires_in, value)
+    return value
+
+async def _cached_response(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: Union[float, Callable[[Any], float]],
+) -> Any:
+    """TTL 동안 응답을 재사용하고, 캐시 미스가 동시에 몰리면 한 번만 계산 (single-flight)"""
+    entry = _response_cache.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_compute_and_store(key, compute, ttl))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # 먼저 요청한 클라이언트가 끊겨도 대기 중인 다른 요청을 위해 계산은 계속 진행
+    return await asyncio.shield(task)
+
+# psutil(C 확장)은 import 비용을 줄이기 위해 첫 사용 시점에 로드
+_psutil = None
+
+def _ps():
+    global _psutil
+    if _psutil is None:
+        import psutil
+        _psutil = psutil
+    return _psutil
+
+# 현재 프로세스 핸들: cpu_percent()는 같은 객체의 직전 호출 대비 값을 계산하므로 재사용해야 함
+_PROC = None
+
+def _process():
+    global _PROC
+    if _PROC is None:
+        _PROC = _ps().Process()
+    return _PROC
+
+def prime_process_cpu() -> None:
+    """첫 /metrics 호출이 0.0을 반환하지 않도록 프로세스 CPU 카운터 기준점 설정 (lifespan에서 호출)"""
+    _process().cpu_percent()
+
+# psutil 조회 캐시: 함수 이름 -> (값, 만료 시각(monotonic))
+_psutil_cache: Dict[str, Tuple[Any, float]] = {}
 
-# 의존성 주입
-def get_bigquery_helper() -> BigQueryHelper:
-    """BigQuery 헬퍼 인스턴스 반환"""
-    return BigQueryHelper()
+def _cached(ttl: float):
+    """인자 없는 psutil 조회 함수의 결과를 ttl초 동안 재사용"""
+    def decorator(func):
+        key = func.__name__
 
-@router.get("/health", response_model=HealthStatus)
+        @wraps(func)
+        def wrapper():
+            entry = _psutil_cache.get(key)
+            now = time.monotonic()
+            if entry is not None and now < entry[1]:
+                return entry[0]
+            value = func()
+            _psutil_cache[key] = (value, now + ttl)
+            return value
+        return wrapper
+    return decorator
+
+@_cached(ttl=1.0)
+def _vmem():
+    return _ps().virtual_memory()
+
+@_cached(ttl=1.0)
+def _memory_summary() -> Tuple[int, int, float]:
+    """(전체, 사용 가능, 사용률%) - Linux에서는 psutil 대신 /proc/meminfo를 직접 읽음"""
+    if IS_LINUX:
+        try:
+            info = read_meminfo()
+            total, available = info["MemTotal"], info["MemAvailable"]
+            return total, available, round((total - available) / total * 100, 1)
+        except (OSError, KeyError, ZeroDivisionError):
+            pass
+    memory = _ps().virtual_memory()
+    return memory.total, memory.available, memory.percent
+
+@_cached(ttl=5.0)
+def _disk():
+    return _ps().disk_usage('/')
+
+def _health_ttl(cached: Tuple[Dict[str, Any], str, bytes]) -> float:
+    return HEALTHY_CACHE_TTL if cached[0]["status"] == "healthy" else UNHEALTHY_CACHE_TTL
+
+def _make_etag(content: bytes) -> str:
+    # 본문 일부(상태/체크 항목)만 반영하므로 바이트 단위 동일성을 약속하지 않는 약한 ETag
+    return 'W/"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+
+def _json_bytes_response(body: bytes, headers: Dict[str, str]) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return any(
+        tag.strip().removeprefix("W/") in (etag.removeprefix("W/"), "*")
+        for tag in if_none_match.split(",")
+    )
+
+def _not_modified(etag: str, max_age: int) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": f"max-age={max_age}"},
+    )
+
+# 아래 엔드포인트들은 응답을 직접 구성하므로 response_model 검증/직렬화를 생략하고,
+# 스키마는 OpenAPI 문서용으로만 responses에 등록
+@router.get("/health", response_model=None, responses={200: {"model": HealthStatus}})
 async def health_check(
+    request: Request,
     bq_helper: BigQueryHelper = Depends(get_bigquery_helper)
 ):
     """
     시스템 헬스체크를 수행합니다.
     
+    로드밸런서 폴링이 매번 BigQuery/psutil을 호출하지 않도록 결과를 짧게 캐시하고,
+    If-None-Match가 캐시된 ETag와 같으면 본문 없이 304를 반환합니다.
+    
     Returns:
         HealthStatus: 시스템 상태 정보
     """
+    # lifespan에서 한 번 계산해 둔 누락 환경 변수 (lifespan 없이 라우터만 쓰는 경우 직접 계산)
+    missing_env = getattr(request.app.state, "missing_env", None)
+    if missing_env is None:
+        missing_env = find_missing_env()
+    cached = await _cached_response(
+        "health", lambda: _compute_health_entry(bq_helper, missing_env), _health_ttl
+    )
+    _, etag, body = cached
+    max_age = int(_health_ttl(cached))
+    if _etag_matches(request, etag):
+        return _not_modified(etag, max_age)
+    return _json_bytes_response(body, {"ETag": etag, "Cache-Control": f"max-age={max_age}"})
+
+async def _compute_health_entry(
+    bq_helper: BigQueryHelper, missing_env: Tuple[str, ...]
+) -> Tuple[Dict[str, Any], str, bytes]:
+    """헬스체크 결과, ETag(상태 + 체크 항목 기준), 인코딩된 본문을 함께 계산"""
+    health = await _compute_health(bq_helper, missing_env)
+    etag = _make_etag(orjson.dumps({"status": health["status"], "checks": health["checks"]}))
+    return health, etag, orjson.dumps(health)
+
+# 하위 체크 상태 중 전체 상태를 degraded로 낮추는 값
+_DEGRADING_STATUSES = frozenset({"unhealthy", "degraded", "error"})
+
+_SQL_ENGINE_INFO = {
+    "status": "informational",
+    "mode": "dynamic-fusion",
+    "description": "Gemini + 패턴 기반 템플릿으로 SQL을 조합합니다.",
+    "components": [
+        "Gemini LLM",
+        "Pattern intent/entity extractor",
+        "Template fallback library"
+    ]
+}
+
+async def _check_bigquery(bq_helper: BigQueryHelper) -> Tuple[str, Dict[str, Any]]:
+    """BigQuery 연결 체크 (동기 클라이언트이므로 스레드에서 실행)
+
+    요청 경로가 보는 공유 오류 상태를 바꾸지 않도록 실패는 예외로만 받고,
+    캐시된 목록으로 응답 시간을 재지 않도록 메타데이터 캐시를 건너뜁니다.
+    """
     try:
-        checks = {}
-        overall_status = "healthy"
-        
-        # 1. BigQuery 연결 체크
-        try:
-            start_time = datetime.now()
-            tables = bq_helper.list_tables()
-            bq_response_time = (datetime.now() - start_time).total_seconds()
-            
-            checks["bigquery"] = {
-                "status": "healthy",
-                "response_time": bq_response_time,
-                "table_count": len(tables)
-            }
-        except Exception as e:
-            checks["bigquery"] = {
-                "status": "unhealthy",
-                "error": str(e)
-            }
-            overall_status = "degraded"
-        # 2. AI 모델 상태 체크
-        try:
-            ai_client = get_ai_client()
-            provider_status = ai_client.get_provider_status()
-            current_provider = provider_status.get("current_provider", "none")
-            providers = provider_status.get("providers", {})
-            provider_info = {}
-            if isinstance(providers, dict):
-                provider_info = providers.get(current_provider) or {}
-            current_model = provider_info.get("model")
-
-            ai_status = "healthy" if current_provider != "none" else "degraded"
-            if ai_status != "healthy" and overall_status == "healthy":
-                overall_status = "degraded"
-
-            checks["ai"] = {
-                "status": ai_status,
-                "provider": current_provider,
-                "model": current_model,
-            }
-        except Exception as exc:
-            checks["ai"] = {
-                "status": "error",
-                "error": str(exc)
-            }
-            if overall_status == "healthy":
-                overall_status = "degraded"
-
-        # 3. SQL 생성 엔진 정보
-        checks["sql_engine"] = {
-            "status": "informational",
-            "mode": "dynamic-fusion",
-            "description": "Gemini + 패턴 기반 템플릿으로 SQL을 조합합니다.",
-            "components": [
-                "Gemini LLM",
-                "Pattern intent/entity extractor",
-                "Template fallback library"
-            ]
+        start_time = time.monotonic()
+        tables = await asyncio.to_thread(
+            bq_helper.list_tables, raise_errors=True, use_cache=False
+        )
+        bq_response_time = time.monotonic() - start_time
+        return "bigquery", {
+            "status": "healthy",
+            "response_time": bq_response_time,
+            "table_count": len(tables)
         }
-        
-        # 4. 메모리 사용량 체크
-        try:
-            memory = psutil.virtual_memory()
-            memory_usage_percent = memory.percent
-            
-            if memory_usage_percent > 90:
-                memory_status = "unhealthy"
-                overall_status = "degraded"
-            elif memory_usage_percent > 75:
-                memory_status = "degraded"
-                if overall_status == "healthy":
-                    overall_status = "degraded"
-            else:
-                memory_status = "healthy"
-            
-            checks["memory"] = {
-                "status": memory_status,
-                "usage_percent": memory_usage_percent,
-                "available_gb": round(memory.available / (1024**3), 2)
-            }
-        except Exception as e:
-            checks["memory"] = {
-                "status": "error",
-                "error": str(e)
-            }
-        
-        # 5. 디스크 사용량 체크
-        try:
-            disk = psutil.disk_usage('/')
-            disk_usage_percent = (disk.used / disk.total) * 100
-            
-            if disk_usage_percent > 90:
-                disk_status = "unhealthy"
-                overall_status = "degraded"
-            elif disk_usage_percent > 80:
-                disk_status = "degraded"
-                if overall_status == "healthy":
-                    overall_status = "degraded"
-            else:
-                disk_status = "healthy"
-            
-            checks["disk"] = {
-                "status": disk_status,
-                "usage_percent": round(disk_usage_percent, 2),
-                "free_gb": round(disk.free / (1024**3), 2)
-            }
-        except Exception as e:
-            checks["disk"] = {
-                "status": "error",
-                "error": str(e)
-            }
-        
-        # 6. 환경 변수 체크
-        required_env_vars = [
-            'GOOGLE_CLOUD_PROJECT',
-            'BIGQUERY_DATASET'
-        ]
-        
-        missing_vars = []
-        for var in required_env_vars:
-            if not os.getenv(var):
-                missing_vars.append(var)
-        
-        if missing_vars:
-            checks["environment"] = {
-                "status": "degraded",
-                "missing_variables": missing_vars
-            }
-            overall_status = "degraded"
-        else:
-            checks["environment"] = {
-                "status": "healthy",
-                "all_variables_present": True
-            }
+    except Exception as e:
+        return "bigquery", {
+            "status": "unhealthy",
+            "error": str(e)
+        }
+
+async def _check_ai() -> Tuple[str, Dict[str, Any]]:
+    """AI 모델 상태 체크"""
+    try:
+        ai_client = get_ai_client()
+        provider_status = ai_client.get_provider_status()
+        current_provider = provider_status.get("current_provider", "none")
+        providers = provider_status.get("providers", {})
+        provider_info = {}
+        if isinstance(providers, dict):
+            provider_info = providers.get(current_provider) or {}
+        return "ai", {
+            "status": "healthy" if current_provider != "none" else "degraded",
+            "provider": current_provider,
+            "model": provider_info.get("model"),
+        }
+    except Exception as exc:
+        return "ai", {
+            "status": "error",
+            "error": str(exc)
+        }
+
+def _usage_status(usage_percent: float, degraded_over: float) -> str:
+    if usage_percent > 90:
+        return "unhealthy"
+    if usage_percent > degraded_over:
+        return "degraded"
+    return "healthy"
+
+async def _check_memory() -> Tuple[str, Dict[str, Any]]:
+    """메모리 사용량 체크"""
+    try:
+        _, available, usage_percent = await asyncio.to_thread(_memory_summary)
+        return "memory", {
+            "status": _usage_status(usage_percent, 75),
+            "usage_percent": usage_percent,
+            "available_gb": round(available / (1024**3), 2)
+        }
+    except Exception as e:
+        return "memory", {
+            "status": "error",
+            "error": str(e)
+        }
+
+async def _check_disk() -> Tuple[str, Dict[str, Any]]:
+    """디스크 사용량 체크"""
+    try:
+        disk = await asyncio.to_thread(_disk)
+        disk_usage_percent = (disk.used / disk.total) * 100
+        return "disk", {
+            "status": _usage_status(disk_usage_percent, 80),
+            "usage_percent": round(disk_usage_percent, 2),
+            "free_gb": round(disk.free / (1024**3), 2)
+        }
+    except Exception as e:
+        return "disk", {
+            "status": "error",
+            "error": str(e)
+        }
+
+REQUIRED_ENV_VARS = (
+    'GOOGLE_CLOUD_PROJECT',
+    'BIGQUERY_DATASET'
+)
+
+@lru_cache(maxsize=1)
+def find_missing_env() -> Tuple[str, ...]:
+    """누락된 필수 환경 변수 (환경 변수는 기동 후 바뀌지 않으므로 한 번만 확인)"""
+    return tuple(var for var in REQUIRED_ENV_VARS if not os.getenv(var))
+
+def _check_env(missing_env: Tuple[str, ...]) -> Tuple[str, Dict[str, Any]]:
+    """필수 환경 변수 체크"""
+    if missing_env:
+        return "environment", {
+            "status": "degraded",
+            "missing_variables": list(missing_env)
+        }
+    return "environment", {
+        "status": "healthy",
+        "all_variables_present": True
+    }
+
+async def _compute_health(bq_helper: BigQueryHelper, missing_env: Tuple[str, ...]) -> Dict[str, Any]:
+    """헬스체크 항목을 동시에 수행 (전체 소요 시간 = 가장 느린 체크)"""
+    try:
+        checks: Dict[str, Any] = {"sql_engine": _SQL_ENGINE_INFO}
+        results = await asyncio.gather(
+            _check_bigquery(bq_helper),
+            _check_ai(),
+            _check_memory(),
+            _check_disk(),
+        )
+        results.append(_check_env(missing_env))
+        checks.update(results)
+
+        degraded = any(check["status"] in _DEGRADING_STATUSES for _, check in results)
+        overall_status = "degraded" if degraded else "healthy"
         
         # 업타임 계산
-        uptime = (datetime.now() - START_TIME).total_seconds()
+        uptime = time.monotonic() - START_TIME
         
-        return HealthStatus(
-            status=overall_status,
-            timestamp=datetime.now(),
-            version="1.0.0",
-            uptime=uptime,
-            checks=checks
-        )
+        return {
+            "status": overall_status,
+            "timestamp": datetime.now(),
+            "version": "1.0.0",
+            "uptime": uptime,
+            "checks": checks,
+        }
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return HealthStatus(
-            status="unhealthy",
-            timestamp=datetime.now(),
-            version="1.0.0",
-            uptime=(datetime.now() - START_TIME).total_seconds(),
-            checks={"error": str(e)}
-        )
+        return {
+            "status": "unhealthy",
+            "timestamp": datetime.now(),
+            "version": "1.0.0",
+            "uptime": time.monotonic() - START_TIME,
+            "checks": {"error": str(e)},
+        }
 
-@router.get("/info", response_model=SystemInfo)
+@router.get("/info", response_model=None, responses={200: {"model": SystemInfo}})
 async def get_system_info():
     """
     시스템 정보를 반환합니다.
@@ -227,14 +383,11 @@ async def get_system_info():
         SystemInfo: 시스템 정보
     """
     try:
-        import platform
-        import sys
-        
         # 메모리 정보
-        memory = psutil.virtual_memory()
+        memory_total, memory_available, _ = _memory_summary()
         
         # 디스크 정보
-        disk = psutil.disk_usage('/')
+        disk = _disk()
         disk_info = {
             "total_gb": round(disk.total / (1024**3), 2),
             "used_gb": round(disk.used / (1024**3), 2),
@@ -242,15 +395,15 @@ async def get_system_info():
             "usage_percent": round((disk.used / disk.total) * 100, 2)
         }
         
-        return SystemInfo(
-            python_version=sys.version,
-            platform=platform.platform(),
-            cpu_count=psutil.cpu_count(),
-            memory_total=memory.total,
-            memory_available=memory.available,
-            disk_usage=disk_info,
-            environment=os.getenv('ENVIRONMENT', 'development')
-        )
+        return orjson_response({
+            "python_version": sys.version,
+            "platform": platform.platform(),
+            "cpu_count": _ps().cpu_count(),
+            "memory_total": memory_total,
+            "memory_available": memory_available,
+            "disk_usage": disk_info,
+            "environment": os.getenv('ENVIRONMENT', 'development'),
+        })
         
     except Exception as e:
         logger.error(f"Error getting system info: {e}")
@@ -259,7 +412,7 @@ async def get_system_info():
             detail=f"시스템 정보 조회 중 오류가 발생했습니다: {str(e)}"
         )
 
-@router.get("/services", response_model=Dict[str, ServiceStatus])
+@router.get("/services", response_model=None, responses={200: {"model": Dict[str, ServiceStatus]}})
 async def get_service_status(
     bq_helper: BigQueryHelper = Depends(get_bigquery_helper)
 ):
@@ -269,27 +422,36 @@ async def get_service_status(
     Returns:
         Dict[str, ServiceStatus]: 서비스별 상태 정보
     """
+    services = await _cached_response(
+        "services", lambda: _compute_service_status(bq_helper), STATUS_CACHE_TTL
+    )
+    return orjson_response(services)
+
+async def _compute_service_status(bq_helper: BigQueryHelper) -> Dict[str, Dict[str, Any]]:
+    """외부 서비스 상태를 실제로 확인"""
     services = {}
     
     # BigQuery 서비스 상태 확인
     try:
-        start_time = datetime.now()
-        tables = bq_helper.list_tables()
-        response_time = (datetime.now() - start_time).total_seconds()
+        start_time = time.monotonic()
+        await asyncio.to_thread(bq_helper.list_tables, raise_errors=True, use_cache=False)
+        response_time = time.monotonic() - start_time
         
-        services["bigquery"] = ServiceStatus(
-            name="BigQuery",
-            status="online",
-            response_time=response_time,
-            last_check=datetime.now()
-        )
+        services["bigquery"] = {
+            "name": "BigQuery",
+            "status": "online",
+            "response_time": response_time,
+            "last_check": datetime.now(),
+            "error_message": None,
+        }
     except Exception as e:
-        services["bigquery"] = ServiceStatus(
-            name="BigQuery",
-            status="error",
-            last_check=datetime.now(),
-            error_message=str(e)
-        )
+        services["bigquery"] = {
+            "name": "BigQuery",
+            "status": "error",
+            "response_time": None,
+            "last_check": datetime.now(),
+            "error_message": str(e),
+        }
 
     return services
 
@@ -301,35 +463,41 @@ async def get_system_metrics():
     Returns:
         시스템 메트릭 정보
     """
+    return await _cached_response("metrics", _compute_system_metrics, STATUS_CACHE_TTL)
+
+_PROCESS_ATTRS = ("cpu_percent", "memory_percent", "memory_info", "num_threads", "create_time")
+
+async def _compute_system_metrics() -> Dict[str, Any]:
+    """시스템 메트릭을 실제로 수집"""
     try:
-        # CPU 사용률
-        cpu_percent = psutil.cpu_percent(interval=1)
-        
-        # 메모리 정보
-        memory = psutil.virtual_memory()
-        
-        # 디스크 I/O
-        disk_io = psutil.disk_io_counters()
-        
-        # 네트워크 I/O
-        net_io = psutil.net_io_counters()
+        # CPU 사용률은 lifespan에서 시작한 백그라운드 샘플러 값을 사용
+        cpu_window = cpu_sampler.snapshot()
+        if cpu_window is not None:
+            cpu_percent = cpu_window["current"]
+        else:
+            # 샘플러가 없으면 직전 호출 대비 값 (블로킹 없음)
+            cpu_percent = _ps().cpu_percent(interval=None)
+
+        # 메모리, 디스크 I/O, 네트워크 I/O를 스레드에서 동시에 수집
+        memory, disk_io, net_io = await asyncio.gather(
+            asyncio.to_thread(_vmem),
+            asyncio.to_thread(_ps().disk_io_counters),
+            asyncio.to_thread(_ps().net_io_counters),
+        )
         
         # 프로세스 정보
-        process = psutil.Process()
-        process_info = {
-            "cpu_percent": process.cpu_percent(),
-            "memory_percent": process.memory_percent(),
-            "memory_info": process.memory_info()._asdict(),
-            "num_threads": process.num_threads(),
-            "create_time": process.create_time()
-        }
+        process = _process()
+        # as_dict는 oneshot 컨텍스트에서 /proc/<pid> 파일을 한 번씩만 읽음
+        process_info = process.as_dict(attrs=_PROCESS_ATTRS)
+        process_info["memory_info"] = process_info["memory_info"]._asdict()
         
         return {
             "timestamp": datetime.now(),
-            "uptime": (datetime.now() - START_TIME).total_seconds(),
+            "uptime": time.monotonic() - START_TIME,
             "cpu": {
                 "usage_percent": cpu_percent,
-                "count": psutil.cpu_count()
+                "window": cpu_window,
+                "count": _ps().cpu_count()
             },
             "memory": {
                 "total": memory.total,
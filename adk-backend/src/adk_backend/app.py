@@ -1,42 +1,43 @@
 from __future__ import annotations
 
-import asyncio
-import json
 import time
 import os
-import signal
-import sys
 import logging
 from typing import Any, AsyncIterator, Dict, Optional
 from datetime import datetime
 from contextlib import asynccontextmanager
+from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
 
 # ⚠️ IMPORTANT: .env 파일을 먼저 로드해야 다른 모듈의 config가 환경 변수를 읽을 수 있습니다
 # 환경 변수 로드 (프로젝트 루트의 .env 파일)
 # adk-backend/src/adk_backend/app.py에서 ../../../.env로 접근
-project_root = os.path.join(os.path.dirname(__file__), '..', '..', '..')
-dotenv_path = os.path.join(project_root, '.env')
+project_root = Path(__file__).resolve().parents[3]
+dotenv_path = project_root / ".env"
 load_dotenv(dotenv_path=dotenv_path)
 
 # .env 로드 후 다른 모듈 import
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from google.genai import types as genai_types
 from pydantic import BaseModel, Field
 
 from .config import get_settings
-from .live import LiveRunManager, format_sse_message
-from .tools.bigquery import bigquery_list_templates, bigquery_render_template
+from .live import LiveRunManager
+from .tools.bigquery import bigquery_dry_run, bigquery_list_templates, bigquery_render_template
 from .sessions import ensure_session
 from .workflows.divorce import get_runner
 from .nlp.gemini_client import initialize_gemini_client_with_cag
+from .utils.bigquery_helper import close_bigquery_helper
+from .utils.cpu_sampler import cpu_sampler
 
 # API 라우터 import
 from .api import chat, data, system
+from .api.responses import DEFAULT_RESPONSE_CLASS, orjson_response
 
 # 로깅 설정 import
 from .utils.logging_config import setup_logging
@@ -48,20 +49,6 @@ setup_logging(level=log_level, enable_colors=True)
 logger = logging.getLogger(__name__)
 
 
-# Signal handler for graceful shutdown
-def handle_shutdown_signal(signum, frame):
-    """Ctrl+C (SIGINT) 및 SIGTERM 신호를 깔끔하게 처리"""
-    logger.info("\n" + "="*80)
-    logger.info("🛑 Shutdown signal received. Cleaning up...")
-    logger.info("="*80)
-    sys.exit(0)
-
-
-# Register signal handlers
-signal.signal(signal.SIGINT, handle_shutdown_signal)
-signal.signal(signal.SIGTERM, handle_shutdown_signal)
-
-
 # Lifespan context manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -82,11 +69,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ CAG 초기화 실패: {str(e)}")
 
+    # 2. /api/system/metrics 용 CPU 사용률 백그라운드 샘플링
+    cpu_sampler.start()
+    system.prime_process_cpu()
+
+    # 3. 필수 환경 변수 확인 (기동 후에는 바뀌지 않으므로 헬스체크가 재사용)
+    app.state.missing_env = system.find_missing_env()
+
     yield
 
-    # Shutdown
+    # Shutdown (SIGINT/SIGTERM은 uvicorn이 처리하고 진행 중인 요청이 끝난 뒤 여기로 옴)
     logger.info("=" * 80)
     logger.info("👋 Unified Divorce Intelligence Platform Shutting down...")
+    await cpu_sampler.stop()
+    try:
+        close_bigquery_helper()
+    except Exception as e:
+        logger.warning(f"BigQuery 클라이언트 정리 실패: {e}")
     logger.info("=" * 80)
 
 
@@ -94,13 +93,14 @@ app = FastAPI(
     title="Unified Divorce Intelligence Platform",
     description="Gemini 멀티모달 AI와 BigQuery 기반의 통합 이혼 솔루션 플랫폼",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DEFAULT_RESPONSE_CLASS,
 )
 settings = get_settings()
 live_manager = LiveRunManager()
 
 # CORS 설정
-origins = [
+_DEFAULT_ORIGINS = (
     "http://localhost:3000",  # React 개발 서버
     "http://localhost:5173",  # Vite 개발 서버
     "http://localhost:8005",  # Frontend 서버
@@ -109,16 +109,17 @@ origins = [
     "http://127.0.0.1:5173",
     "http://127.0.0.1:8005",
     "http://127.0.0.1:8006",
-]
+)
 
-# 환경 변수에서 추가 origins 로드
-if os.getenv('CORS_ORIGINS'):
-    additional_origins = os.getenv('CORS_ORIGINS').split(',')
-    origins.extend([origin.strip() for origin in additional_origins])
+# 환경 변수에서 추가 origins 로드 (쉼표 구분, 빈 항목 무시)
+_extra_origins = tuple(
+    origin.strip() for origin in os.getenv("CORS_ORIGINS", "").split(",") if origin.strip()
+)
+ORIGINS = (*_DEFAULT_ORIGINS, *_extra_origins)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origins=ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -147,9 +148,9 @@ class RunRequest(BaseModel):
 
 def _serialize_event(event: Any) -> Dict[str, Any]:
     try:
-        payload = event.model_dump(by_alias=True, exclude_none=True)
+        payload = event.model_dump(mode="json", by_alias=True, exclude_none=True)
     except AttributeError:  # pragma: no cover - defensive
-        payload = json.loads(json.dumps(event, default=str))
+        payload = orjson.loads(orjson.dumps(event, default=str, option=orjson.OPT_NAIVE_UTC))
     payload["_meta"] = {"timestamp": time.time()}
     return payload
 
@@ -197,11 +198,11 @@ async def legacy_health_check():
 
 
 @app.post("/api/run")
-async def run(request: RunRequest) -> JSONResponse:
+async def run(request: RunRequest) -> Response:
     if not request.prompt:
         raise HTTPException(status_code=400, detail="prompt is required")
     result = await _run_once(request)
-    return JSONResponse(result)
+    return orjson_response(result)
 
 
 class LiveRunRequest(BaseModel):
@@ -236,16 +237,13 @@ async def stream_events(run_id: str, request: Request):
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    async def event_generator() -> AsyncIterator[str]:
+    async def event_generator() -> AsyncIterator[bytes]:
         try:
             while True:
                 if await request.is_disconnected():
                     break
-                try:
-                    message = await asyncio.wait_for(queue.get(), timeout=15.0)
-                    yield format_sse_message(message)
-                except asyncio.TimeoutError:
-                    yield "event: keepalive\ndata: {}\n\n"
+                # 큐에는 LiveRunManager가 미리 직렬화한 SSE 프레임(keepalive 포함)이 들어 있음
+                yield await queue.get()
         finally:
             await live_manager.unsubscribe(run_id, queue)
 
@@ -255,8 +253,8 @@ async def stream_events(run_id: str, request: Request):
 @app.get("/api/templates")
 async def list_templates() -> Dict[str, Any]:
     """사용 가능한 BigQuery 템플릿 목록을 반환."""
-    result_json = bigquery_list_templates()
-    return json.loads(result_json)
+    # 도구가 이미 dict를 반환하므로 JSON 문자열 왕복 없이 그대로 응답
+    return bigquery_list_templates()
 
 
 class RenderTemplateRequest(BaseModel):
@@ -269,11 +267,13 @@ class RenderTemplateRequest(BaseModel):
 @app.post("/api/templates/render")
 async def render_template(request: RenderTemplateRequest) -> Dict[str, Any]:
     """BigQuery 템플릿을 렌더링."""
-    params_json = json.dumps(request.params) if request.params else None
-    result_json = bigquery_render_template(
-        template_id=request.template_id,
-        params_json=params_json,
-        dry_run=request.dry_run,
-        project_id=request.project_id,
-    )
-    return json.loads(result_json)
+    params = request.params or {}
+    try:
+        sql = bigquery_render_template(request.template_id, params)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    result: Dict[str, Any] = {"template_id": request.template_id, "sql": sql, "params": params}
+    if request.dry_run:
+        result["dry_run"] = bigquery_dry_run(sql)
+    return result
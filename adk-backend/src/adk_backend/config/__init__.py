@@ -51,6 +51,15 @@ class Settings(BaseSettings):
     # 기본값: 5분
     cag_cache_ttl_minutes: int = Field(default=5, alias="CAG_CACHE_TTL_MINUTES")
 
+    # Gemini 명시적 컨텍스트 캐시 (CachedContent)
+    # - 디폴트: False (캐시 저장 비용이 발생하므로 명시적으로 켜야 함)
+    # - True: 정적 프롬프트(시스템 메시지 + CAG + 예시)가 최소 토큰 수 이상인 PromptType만
+    #   서버 측 캐시에 올리고 요청마다 질문 부분만 전송 (TTL은 CAG_CACHE_TTL_MINUTES 사용)
+    enable_gemini_explicit_cache: bool = Field(default=False, alias="ENABLE_GEMINI_EXPLICIT_CACHE")
+
+    # Gemini 동시 호출 상한 (RPM 쿼터 보호용)
+    gemini_max_concurrency: int = Field(default=8, alias="GEMINI_MAX_CONCURRENCY")
+
     # 기타 설정
     analytics_api_url: Optional[str] = Field(default=None, alias="ANALYTICS_API_URL")
     environment: str = Field(default="development", alias="ENVIRONMENT")
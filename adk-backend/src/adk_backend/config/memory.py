@@ -5,21 +5,73 @@ Memory Service 설정
 프로덕션: VertexAiMemoryBankService (영구, Vertex AI)
 """
 import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Tuple
+
 from google.adk.memory import (
     InMemoryMemoryService,
     VertexAiMemoryBankService
 )
 
-# 개발용 메모리 서비스 (재시작 시 소실)
-dev_memory_service = InMemoryMemoryService()
+DEFAULT_MAX_MEMORY_SESSIONS = 10_000
 
-# 프로덕션용 메모리 서비스 (Vertex AI Memory Bank)
-production_memory_service = VertexAiMemoryBankService(
-    project=os.getenv("GOOGLE_CLOUD_PROJECT", "pio-test-36cf5"),
-    location=os.getenv("GOOGLE_CLOUD_LOCATION", "asia-northeast3")
-)
+
+class BoundedInMemoryMemoryService(InMemoryMemoryService):
+    """저장 세션 수에 상한이 있는 InMemoryMemoryService
+
+    기본 구현은 프로세스가 살아있는 동안 세션을 무한히 쌓으므로,
+    최근에 저장된 max_sessions개만 남기고 가장 오래된 세션부터 제거합니다.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_MEMORY_SESSIONS):
+        super().__init__()
+        self._max_sessions = max_sessions
+        # (app_name/user_id, session_id) -> None, 저장 순서 (LRU)
+        self._session_order: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+
+    async def add_session_to_memory(self, session) -> None:
+        await super().add_session_to_memory(session)
+        # 상위 클래스의 _session_events 키 형식("{app_name}/{user_id}")과 동일
+        entry = (f"{session.app_name}/{session.user_id}", session.id)
+        with self._lock:
+            self._session_order[entry] = None
+            self._session_order.move_to_end(entry)
+            while len(self._session_order) > self._max_sessions:
+                (user_key, session_id), _ = self._session_order.popitem(last=False)
+                user_sessions = self._session_events.get(user_key)
+                if user_sessions is None:
+                    continue
+                user_sessions.pop(session_id, None)
+                if not user_sessions:
+                    del self._session_events[user_key]
+
+
+@lru_cache(maxsize=1)
+def _dev_memory_service() -> BoundedInMemoryMemoryService:
+    """개발용 메모리 서비스 (재시작 시 소실, 세션 수 상한 적용)"""
+    return BoundedInMemoryMemoryService()
+
+
+@lru_cache(maxsize=1)
+def _production_memory_service() -> VertexAiMemoryBankService:
+    """프로덕션용 메모리 서비스 (Vertex AI Memory Bank) - 선택된 경우에만 생성"""
+    return VertexAiMemoryBankService(
+        project=os.getenv("GOOGLE_CLOUD_PROJECT", "pio-test-36cf5"),
+        location=os.getenv("GOOGLE_CLOUD_LOCATION", "asia-northeast3")
+    )
+
+
+def __getattr__(name: str):
+    # 기존 모듈 속성 이름 호환 (접근 시점에 생성)
+    if name == "dev_memory_service":
+        return _dev_memory_service()
+    if name == "production_memory_service":
+        return _production_memory_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+@lru_cache(maxsize=1)
 def get_memory_service():
     """
     환경 변수에 따라 적절한 메모리 서비스 반환
@@ -40,24 +92,24 @@ def get_memory_service():
 
     if memory_service_type == "inmemory":
         print("🧪 Using InMemory Service (명시적 지정)")
-        return dev_memory_service
+        return _dev_memory_service()
 
     if memory_service_type == "memorybank":
         print("🏢 Using Memory Bank (명시적 지정)")
-        return production_memory_service
+        return _production_memory_service()
 
     # 환경 기반 자동 선택
     env = os.getenv("ENVIRONMENT", "development")
 
     if env == "production":
         print("🏢 Using Memory Bank (프로덕션 환경)")
-        return production_memory_service
+        return _production_memory_service()
     elif env == "staging":
         print("🏢 Using Memory Bank (스테이징 환경)")
-        return production_memory_service
+        return _production_memory_service()
     else:
         print("🧪 Using InMemory Service (개발 환경)")
-        return dev_memory_service
+        return _dev_memory_service()
 
 
 # 전역 메모리 서비스 인스턴스
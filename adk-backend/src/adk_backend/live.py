@@ -1,36 +1,172 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import dataclasses
+import itertools
 import time
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
+import orjson
 from google.genai import types as genai_types
 
 from .sessions import ensure_session
 from .workflows.divorce import get_runner
 
+# 유휴 SSE 연결 유지를 위한 keepalive 주기 (초)
+KEEPALIVE_INTERVAL = 15.0
+# 구독 큐에 그대로 넣는 미리 인코딩한 keepalive SSE 프레임
+KEEPALIVE_FRAME = b"event: keepalive\ndata: {}\n\n"
+# 구독자 큐 상한 (가득 차면 가장 오래된 메시지를 버려 느린 클라이언트가 run을 막지 않도록 함)
+SUBSCRIBER_QUEUE_SIZE = 1024
+# adk.event 배치 기준: 이 개수가 모이거나 첫 이벤트 후 이 시간(초)이 지나면 한 번에 내보냄
+BATCH_MAX_EVENTS = 16
+BATCH_WINDOW = 0.005
+# 스트림 종료를 알리는 큐 센티널
+_STREAM_END = object()
+# 끝난 run의 히스토리를 재구독용으로 보관하는 시간 (초), 이후 메모리에서 제거
+RUN_RETENTION_SECONDS = 300.0
 
-def _serialize_event(event: Any) -> Dict[str, Any]:
+
+def _offer(queue: asyncio.Queue, frame: bytes) -> None:
+    """await 없이 큐에 넣고, 가득 찼으면 가장 오래된 항목을 버린 뒤 다시 시도"""
     try:
-        payload = event.model_dump(by_alias=True, exclude_none=True)
-    except AttributeError:  # pragma: no cover - defensive
-        payload = json.loads(json.dumps(event, default=str))
+        queue.put_nowait(frame)
+    except asyncio.QueueFull:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:  # pragma: no cover - 소비자가 그 사이에 비운 경우
+            pass
+        queue.put_nowait(frame)
+
+
+def _dump_model(event: Any) -> Dict[str, Any]:
+    # mode="json"으로 datetime/enum/bytes 등을 미리 JSON 기본 타입으로 변환 (SSE 직렬화 시 재변환 없음)
+    return event.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def _dump_dataclass(event: Any) -> Dict[str, Any]:
+    return dataclasses.asdict(event)
+
+
+def _dump_attributes(event: Any) -> Dict[str, Any]:
+    return dict(vars(event))
+
+
+def _dump_generic(event: Any) -> Dict[str, Any]:
+    return orjson.loads(orjson.dumps(event, default=str))
+
+
+# 이벤트 타입별 변환 함수 (타입마다 한 번만 판별)
+_EVENT_DUMPERS: "WeakKeyDictionary[type, Callable[[Any], Dict[str, Any]]]" = WeakKeyDictionary()
+
+
+def _resolve_dumper(event: Any) -> Callable[[Any], Dict[str, Any]]:
+    if hasattr(event, "model_dump"):
+        return _dump_model
+    if dataclasses.is_dataclass(event):
+        return _dump_dataclass
+    if hasattr(event, "__dict__"):
+        return _dump_attributes
+    return _dump_generic
+
+
+def _serialize_event(event: Any) -> Dict[str, Any]:
+    event_type = type(event)
+    dumper = _EVENT_DUMPERS.get(event_type)
+    if dumper is None:
+        dumper = _EVENT_DUMPERS[event_type] = _resolve_dumper(event)
+    payload = dumper(event)
     payload["_meta"] = {"timestamp": time.time()}
     return payload
 
 
-def format_sse_message(message: Dict[str, Any]) -> str:
+def format_sse_message(message: Dict[str, Any]) -> bytes:
     event_name = message.get("event", "message")
     data = message.get("data", {})
-    lines: List[str] = []
+    lines: List[bytes] = []
     if "id" in message:
-        lines.append(f"id: {message['id']}")
-    lines.append(f"event: {event_name}")
-    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
-    return "\n".join(lines) + "\n\n"
+        lines.append(f"id: {message['id']}".encode())
+    lines.append(f"event: {event_name}".encode())
+    lines.append(b"data: " + orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS))
+    return b"\n".join(lines) + b"\n\n"
+
+
+async def coalesce_sse_frames(
+    messages: AsyncIterator[Dict[str, Any]],
+    *,
+    max_events: int = BATCH_MAX_EVENTS,
+    window: float = BATCH_WINDOW,
+    keepalive: float = KEEPALIVE_INTERVAL,
+) -> AsyncIterator[bytes]:
+    """메시지 스트림을 SSE 프레임으로 인코딩하고 짧은 시간 안에 나온 프레임을 한 청크로 묶어 내보냄
+
+    첫 프레임 이후 window(초) 동안 또는 max_events개가 모일 때까지 모은 프레임을 한 번에 yield 하므로
+    thought 토큰처럼 잘게 쪼개진 이벤트도 소켓 write 한 번으로 전송됩니다.
+    keepalive(초) 동안 프레임이 없으면 KEEPALIVE_FRAME을 보냅니다.
+    클라이언트가 느리면 큐가 SUBSCRIBER_QUEUE_SIZE에서 차서 생산 측(pump)이 기다립니다.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    async def pump() -> None:
+        try:
+            async for message in messages:
+                await queue.put(format_sse_message(message))
+        except asyncio.CancelledError:
+            # 소비 측이 끝나 취소된 경우에는 종료 표시를 받을 쪽이 없음
+            raise
+        except BaseException:
+            await queue.put(_STREAM_END)
+            raise
+        await queue.put(_STREAM_END)
+
+    pump_task = asyncio.create_task(pump())
+    # 타임아웃 시 취소하지 않고 다음 대기에서 이어 쓰는 get 태스크 (취소 경합으로 프레임을 잃지 않도록)
+    getter: Optional[asyncio.Future] = None
+
+    async def next_frame(timeout: float) -> Any:
+        nonlocal getter
+        if getter is None:
+            if not queue.empty():
+                return queue.get_nowait()
+            getter = asyncio.ensure_future(queue.get())
+        done, _ = await asyncio.wait((getter,), timeout=timeout)
+        if not done:
+            return None
+        frame, getter = getter.result(), None
+        return frame
+
+    loop = asyncio.get_running_loop()
+    try:
+        ended = False
+        while not ended:
+            frame = await next_frame(keepalive)
+            if frame is None:
+                yield KEEPALIVE_FRAME
+                continue
+            if frame is _STREAM_END:
+                break
+            batch = [frame]
+            deadline = loop.time() + window
+            while len(batch) < max_events:
+                frame = await next_frame(max(deadline - loop.time(), 0.0))
+                if frame is None:
+                    break
+                if frame is _STREAM_END:
+                    ended = True
+                    break
+                batch.append(frame)
+            yield b"".join(batch)
+        # 스트림 생성 중 발생한 예외를 호출 측으로 전달
+        await pump_task
+    finally:
+        # 클라이언트 연결이 끊기면 생산 측 스트림도 더 돌지 않도록 pump까지 취소
+        for task in (getter, pump_task):
+            if task is not None and not task.done():
+                task.cancel()
 
 
 @dataclass(slots=True)
@@ -41,17 +177,35 @@ class RunContext:
     created_at: float = field(default_factory=time.time)
 
 
+@dataclass(slots=True)
+class RunState:
+    """run별 상태
+
+    모든 갱신은 이벤트 루프 스레드에서 await 없이 끝나므로 별도 락을 두지 않음
+    """
+
+    context: RunContext
+    # 이벤트별로 한 번만 직렬화한 SSE 프레임 (재전송 시 그대로 이어 붙임)
+    history: Deque[bytes]
+    # 구독/해제 시 새 튜플로 교체하므로 읽는 쪽은 락 없이 스냅샷으로 사용 가능
+    subscribers: Tuple[asyncio.Queue, ...] = ()
+    task: Optional[asyncio.Task] = None
+    # 아직 내보내지 않은 adk.event 배치와 시간 기준 flush 타이머
+    pending: List[Dict[str, Any]] = field(default_factory=list)
+    flush_handle: Optional[asyncio.TimerHandle] = None
+
+
 class LiveRunManager:
     """Manage live ADK runs and SSE subscribers."""
 
     def __init__(self, *, max_history: int = 500) -> None:
-        self._contexts: Dict[str, RunContext] = {}
-        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
-        self._history: Dict[str, List[Dict[str, Any]]] = {}
-        self._tasks: Dict[str, asyncio.Task] = {}
+        self._runs: Dict[str, RunState] = {}
+        # 러너는 첫 run 시작 시 한 번만 가져옴 (모듈 import 시점에 에이전트를 만들지 않도록 지연)
+        self._runner = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._subscriber_count = 0
         self._max_history = max_history
-        self._lock = asyncio.Lock()
-        self._sequence = 0
+        self._sequence = itertools.count(1)
 
     async def start_run(
         self,
@@ -60,21 +214,18 @@ class LiveRunManager:
         user_id: Optional[str],
         session_id: Optional[str],
     ) -> Tuple[str, str]:
-        runner = get_runner()
+        runner = self._runner
+        if runner is None:
+            runner = self._runner = get_runner()
         session = await ensure_session(user_id, session_id)
         run_id = f"run-{uuid.uuid4().hex[:12]}"
         context = RunContext(session_id=session.id, user_id=session.user_id, prompt=prompt)
+        state = RunState(context=context, history=deque(maxlen=self._max_history))
 
-        async with self._lock:
-            self._contexts[run_id] = context
-            self._subscribers[run_id] = set()
-            self._history[run_id] = []
-
-        task = asyncio.create_task(self._execute(run_id, context, runner))
-        async with self._lock:
-            self._tasks[run_id] = task
+        self._runs[run_id] = state
+        state.task = asyncio.create_task(self._execute(run_id, context, runner))
 
-        await self._publish(
+        self._publish(
             run_id,
             {
                 "event": "run.status",
@@ -89,9 +240,10 @@ class LiveRunManager:
         return run_id, context.session_id
 
     async def _execute(self, run_id: str, context: RunContext, runner) -> None:
-        message = genai_types.Content(
+        # 내부에서 만든 str 프롬프트이므로 pydantic 검증 없이 생성
+        message = genai_types.Content.model_construct(
             role="user",
-            parts=[genai_types.Part(text=context.prompt)],
+            parts=[genai_types.Part.model_construct(text=context.prompt)],
         )
         try:
             async for event in runner.run_async(
@@ -99,14 +251,14 @@ class LiveRunManager:
                 session_id=context.session_id,
                 new_message=message,
             ):
-                await self._publish(
+                self._enqueue(
                     run_id,
                     {
                         "event": "adk.event",
                         "data": _serialize_event(event),
                     },
                 )
-            await self._publish(
+            self._publish(
                 run_id,
                 {
                     "event": "run.status",
@@ -119,7 +271,7 @@ class LiveRunManager:
                 },
             )
         except Exception as exc:  # pragma: no cover - defensive logging
-            await self._publish(
+            self._publish(
                 run_id,
                 {
                     "event": "run.status",
@@ -133,58 +285,115 @@ class LiveRunManager:
                 },
             )
         finally:
-            async with self._lock:
-                self._tasks.pop(run_id, None)
-
-    async def _publish(self, run_id: str, message: Dict[str, Any]) -> None:
-        async with self._lock:
-            if run_id not in self._history:
-                return
-            self._sequence += 1
-            message = dict(message)
-            timestamp = message.setdefault("timestamp", time.time())
-            sequence = self._sequence
+            state = self._runs.get(run_id)
+            if state is not None:
+                state.task = None
+                asyncio.get_running_loop().call_later(
+                    RUN_RETENTION_SECONDS, self._evict, run_id
+                )
+
+    def _evict(self, run_id: str) -> None:
+        """보관 시간이 지난 run 제거 (아직 구독 중인 클라이언트가 있으면 다음 주기로 미룸)"""
+        state = self._runs.get(run_id)
+        if state is None:
+            return
+        if state.subscribers:
+            asyncio.get_running_loop().call_later(RUN_RETENTION_SECONDS, self._evict, run_id)
+            return
+        self._runs.pop(run_id, None)
+
+    def _enqueue(self, run_id: str, message: Dict[str, Any]) -> None:
+        """adk.event를 배치에 쌓고 개수/시간 기준을 만족하면 한 번에 발행"""
+        state = self._runs.get(run_id)
+        if state is None:
+            return
+        state.pending.append(message)
+        if len(state.pending) >= BATCH_MAX_EVENTS:
+            self._flush(state)
+        elif state.flush_handle is None:
+            state.flush_handle = asyncio.get_running_loop().call_later(
+                BATCH_WINDOW, self._flush, state
+            )
+
+    def _take_pending(self, state: RunState) -> List[Dict[str, Any]]:
+        if state.flush_handle is not None:
+            state.flush_handle.cancel()
+            state.flush_handle = None
+        batch, state.pending = state.pending, []
+        return batch
+
+    def _flush(self, state: RunState) -> None:
+        batch = self._take_pending(state)
+        if batch:
+            self._publish_batch(state, batch)
+
+    def _publish(self, run_id: str, message: Dict[str, Any]) -> None:
+        """배치를 기다리지 않고 즉시 발행 (쌓여 있던 adk.event를 앞에 붙여 순서 유지)"""
+        state = self._runs.get(run_id)
+        if state is None:
+            return
+        batch = self._take_pending(state)
+        batch.append(message)
+        self._publish_batch(state, batch)
+
+    def _publish_batch(self, state: RunState, messages: List[Dict[str, Any]]) -> None:
+        # await 없이 끝나므로 순번 부여, 히스토리 기록, 팬아웃 사이에 다른 코루틴이 끼어들 수 없음
+        batch: List[bytes] = []
+        now = time.time()
+        # 호출 측이 매번 새 dict를 만들어 넘기므로 복사 없이 그대로 채움
+        for message in messages:
+            sequence = next(self._sequence)
             message["id"] = sequence
-            data = message.get("data")
-            if isinstance(data, dict):
-                meta = data.get("_meta")
-                if not isinstance(meta, dict):
-                    meta = {}
-                meta.setdefault("timestamp", timestamp)
-                meta.setdefault("sequence", sequence)
-                data["_meta"] = meta
-            history = self._history.setdefault(run_id, [])
-            history.append(message)
-            if len(history) > self._max_history:
-                del history[0 : len(history) - self._max_history]
-            subscribers: Iterable[asyncio.Queue] = list(self._subscribers.get(run_id, set()))
-
-        for queue in subscribers:
-            await queue.put(message)
+            meta = message["data"].setdefault("_meta", {})
+            meta.setdefault("timestamp", now)
+            meta.setdefault("sequence", sequence)
+            batch.append(format_sse_message(message))
+        state.history.extend(batch)
+
+        # 배치당 한 번만 직렬화한 bytes를 모든 구독자가 공유
+        frame = b"".join(batch)
+        for queue in state.subscribers:
+            _offer(queue, frame)
 
     async def subscribe(self, run_id: str) -> asyncio.Queue:
-        async with self._lock:
-            if run_id not in self._history:
-                raise KeyError(f"Unknown run_id: {run_id}")
-            queue: asyncio.Queue = asyncio.Queue()
-            subscribers = self._subscribers.setdefault(run_id, set())
-            subscribers.add(queue)
-            history = list(self._history.get(run_id, []))
-        for message in history:
-            await queue.put(message)
+        state = self._runs.get(run_id)
+        if state is None:
+            raise KeyError(f"Unknown run_id: {run_id}")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        # 히스토리를 먼저 채운 뒤 등록하므로 이후 발행되는 이벤트와 순서가 섞이지 않음
+        if state.history:
+            _offer(queue, b"".join(state.history))
+        state.subscribers = state.subscribers + (queue,)
+        self._subscriber_count += 1
+        self._ensure_keepalive()
         return queue
 
     async def unsubscribe(self, run_id: str, queue: asyncio.Queue) -> None:
-        async with self._lock:
-            subscribers = self._subscribers.get(run_id)
-            if not subscribers:
-                return
-            subscribers.discard(queue)
-            if not subscribers:
-                self._subscribers.pop(run_id, None)
+        state = self._runs.get(run_id)
+        if state is None:
+            return
+        if queue not in state.subscribers:
+            return
+        state.subscribers = tuple(q for q in state.subscribers if q is not queue)
+        self._subscriber_count -= 1
+        if not self._subscriber_count and self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    def _ensure_keepalive(self) -> None:
+        """모든 구독자가 공유하는 keepalive 태스크 하나만 유지 (연결마다 타이머를 두지 않음)"""
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _keepalive_loop(self) -> None:
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            for state in list(self._runs.values()):
+                for queue in state.subscribers:
+                    _offer(queue, KEEPALIVE_FRAME)
 
     async def ensure_task_done(self, run_id: str) -> None:
-        async with self._lock:
-            task = self._tasks.get(run_id)
+        state = self._runs.get(run_id)
+        task = state.task if state is not None else None
         if task:
             await task
@@ -1,6 +1,19 @@
 import re
 from typing import Dict, Any, Optional
 
+# PII patterns, compiled once and combined into a single alternation (one pass per response)
+# - phone: 010-XXXX-XXXX, 010-XXX-XXXX, 010XXXXXXXX
+# - rrn: resident registration number (XXXXXX-XXXXXXX) - Simplified
+_PII_RE = re.compile(
+    r"(?P<phone>010[-.\s]?\d{3,4}[-.\s]?\d{4})"
+    r"|(?P<rrn>\d{6}-[1-4]\d{6})"
+)
+_MASKS = {"phone": "***-****-****", "rrn": "******-*******"}
+
+
+def _mask_pii(match: "re.Match[str]") -> str:
+    return _MASKS[match.lastgroup]
+
 class SecurityError(Exception):
     """Raised when a security violation is detected."""
     pass
@@ -39,19 +52,7 @@ class SensitivityCallback:
         Policy 2: Privacy Check (PII Masking)
         Triggered before sending response to user.
         """
-        # Regex for phone numbers (010-XXXX-XXXX or 010-XXX-XXXX or 010XXXXXXXX)
-        phone_pattern = r"010[-.\s]?\d{3,4}[-.\s]?\d{4}"
-        
-        # Regex for resident registration numbers (XXXXXX-XXXXXXX) - Simplified
-        rrn_pattern = r"\d{6}[-][1-4]\d{6}"
-
-        masked_response = response
-        
-        # Apply Masking
-        masked_response = re.sub(phone_pattern, "***-****-****", masked_response)
-        masked_response = re.sub(rrn_pattern, "******-*******", masked_response)
-        
-        return masked_response
+        return _PII_RE.sub(_mask_pii, response)
 
     def on_step_end(self, step_output: Any) -> None:
         """
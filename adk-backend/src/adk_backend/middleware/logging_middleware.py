@@ -3,99 +3,149 @@ API 요청/응답 로깅 미들웨어
 """
 import time
 import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from typing import Iterable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..utils.logging_config import get_api_logger
 
 logger = logging.getLogger(__name__)
 api_logger = get_api_logger()
 
+DEFAULT_SKIP_PATHS = ("/health", "/docs", "/openapi.json", "/redoc")
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+BODY_PREVIEW_MAX_BYTES = 1000
+
+
+def _content_length(scope: Scope) -> int:
+    """Content-Length 헤더 값 (없거나 잘못된 경우 미리보기를 건너뛰도록 최댓값 반환)"""
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                break
+    return BODY_PREVIEW_MAX_BYTES
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+
+class RequestLoggingMiddleware:
     """
     모든 API 요청/응답을 로깅하는 미들웨어
-    """
 
-    def __init__(self, app: ASGIApp, skip_paths: list[str] = None):
-        super().__init__(app)
-        self.skip_paths = skip_paths or ["/health", "/docs", "/openapi.json", "/redoc"]
+    BaseHTTPMiddleware의 태스크/스트림 래핑 없이 ASGI send를 가로채
+    응답 상태 코드와 응답 시작까지의 시간을 기록합니다.
+    """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip logging for certain paths
-        if any(request.url.path.startswith(path) for path in self.skip_paths):
-            return await call_next(request)
+    def __init__(self, app: ASGIApp, skip_paths: Optional[Iterable[str]] = None):
+        self.app = app
+        self.skip_paths = tuple(skip_paths) if skip_paths is not None else DEFAULT_SKIP_PATHS
 
-        # 요청 시작 시간
-        start_time = time.time()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # 요청 정보 로깅
-        logger.debug(
-            f"→ Request: {request.method} {request.url.path} "
-            f"Client: {request.client.host if request.client else 'unknown'}"
-        )
+        # Skip logging for certain paths
+        path = scope["path"]
+        if path.startswith(self.skip_paths):
+            await self.app(scope, receive, send)
+            return
 
-        # 요청 본문 로깅 (POST/PUT/PATCH만)
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await request.body()
-                if body and len(body) < 1000:  # 1KB 미만만 로깅
-                    logger.debug(f"  Body preview: {body.decode()[:200]}...")
-            except Exception as e:
-                logger.debug(f"  Could not read body: {e}")
+        method = scope["method"]
 
-        # 응답 처리
-        try:
-            response = await call_next(request)
-            status_code = response.status_code
+        # 요청 시작 시간
+        start_ns = time.perf_counter_ns()
 
-            # 응답 시간 계산
-            duration_ms = (time.time() - start_time) * 1000
+        # DEBUG 로그는 비활성화 시 메시지 문자열 자체를 만들지 않도록 한 번만 확인
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
-            # API 로거로 요청/응답 요약 로깅
-            api_logger.info(
-                "",  # 메시지는 RequestLogFormatter에서 처리
-                extra={
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": status_code,
-                    "duration_ms": duration_ms,
-                }
+        # 요청 정보 로깅
+        if debug_enabled:
+            client = scope.get("client")
+            logger.debug(
+                f"→ Request: {method} {path} "
+                f"Client: {client[0] if client else 'unknown'}"
             )
 
-            # 에러 응답 상세 로깅
-            if status_code >= 400:
-                logger.warning(
-                    f"← Response: {status_code} in {duration_ms:.0f}ms "
-                    f"Path: {request.url.path}"
-                )
-            elif duration_ms > 1000:
-                logger.warning(
-                    f"Slow request: {request.method} {request.url.path} "
-                    f"took {duration_ms:.0f}ms"
-                )
-
-            return response
+        # 요청 본문 로깅 (DEBUG 활성화 시 POST/PUT/PATCH 중 Content-Length 1KB 미만만)
+        # 본문을 버퍼링하지 않고 receive를 감싸 앱이 읽는 첫 청크만 미리보기로 남김
+        if (
+            debug_enabled
+            and method in BODY_METHODS
+            and _content_length(scope) < BODY_PREVIEW_MAX_BYTES
+        ):
+            upstream_receive = receive
+            preview_logged = False
+
+            async def receive() -> Message:
+                nonlocal preview_logged
+                message = await upstream_receive()
+                if not preview_logged and message["type"] == "http.request":
+                    preview_logged = True
+                    body = message.get("body", b"")
+                    if body:
+                        logger.debug(f"  Body preview: {body[:200].decode(errors='replace')}...")
+                return message
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start" and not response_started:
+                response_started = True
+                self._log_response(method, path, message["status"], start_ns)
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
+            if response_started:
+                raise
+
             # 예외 발생 시 로깅
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
             logger.error(
-                f"✖ Request failed: {request.method} {request.url.path} "
+                f"✖ Request failed: {method} {path} "
                 f"Error: {str(e)[:100]}"
             )
 
             api_logger.error(
                 "",
                 extra={
-                    "method": request.method,
-                    "path": request.url.path,
+                    "method": method,
+                    "path": path,
                     "status_code": 500,
                     "duration_ms": duration_ms,
                 }
             )
 
             raise
+
+    @staticmethod
+    def _log_response(method: str, path: str, status_code: int, start_ns: int) -> None:
+        # 응답 시간 계산 (응답 헤더 전송 시점까지)
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+
+        # API 로거로 요청/응답 요약 로깅
+        api_logger.info(
+            "",  # 메시지는 RequestLogFormatter에서 처리
+            extra={
+                "method": method,
+                "path": path,
+                "status_code": status_code,
+                "duration_ms": duration_ms,
+            }
+        )
+
+        # 에러 응답 상세 로깅
+        if status_code >= 400:
+            logger.warning(
+                f"← Response: {status_code} in {duration_ms:.0f}ms "
+                f"Path: {path}"
+            )
+        elif duration_ms > 1000:
+            logger.warning(
+                f"Slow request: {method} {path} "
+                f"took {duration_ms:.0f}ms"
+            )
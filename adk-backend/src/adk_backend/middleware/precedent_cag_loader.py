@@ -3,13 +3,31 @@ Precedent CAG (Context-Augmented Generation) Loader
 
 51개 판례 메타데이터를 BigQuery에서 로드하여 Gemini의 Context Cache용 CAG 생성
 """
-import json
 import logging
 from typing import Optional, List, Dict, Any
+
+import orjson
 from google.cloud import bigquery
 
 logger = logging.getLogger(__name__)
 
+# 이 행 수 이상이면 BigQuery Storage API(Arrow)로 컬럼 단위 변환
+ARROW_MIN_ROWS = 1000
+# 요약은 토큰 절감을 위해 앞부분만 포함
+SUMMARY_MAX_CHARS = 200
+# get_cag_summary 머리말 (뒤에 빈 줄 하나를 두고 판례 목록이 이어짐)
+CAG_SUMMARY_HEADER = "# 51개 판례 메타데이터 (Context Cache)\n\n"
+
+
+def _format_case(index: int, case: Dict[str, Any]) -> str:
+    """요약 모드의 판례 한 줄"""
+    return (
+        f"{index}. Case #{case['case_id']}: "
+        f"위자료={case['alimony_amount']:,}원, "
+        f"유책사유={case['fault_type']}, "
+        f"혼인기간={case['marriage_duration_years']}년"
+    )
+
 
 class PrecedentCAGLoader:
     """
@@ -35,6 +53,10 @@ class PrecedentCAGLoader:
         self.dataset_id = dataset_id
         self.table_id = table_id
         self.cag_data: List[Dict[str, Any]] = []
+        # cag_data는 로드 후 바뀌지 않으므로 포맷 결과를 캐싱 (load_metadata 시 초기화)
+        self._cag_bytes: Optional[bytes] = None
+        self._cag_string: Optional[str] = None
+        self._cag_summary: Optional[str] = None
 
     def load_metadata(self) -> bool:
         """
@@ -57,22 +79,42 @@ class PrecedentCAGLoader:
             ORDER BY case_id
             """
 
+            self._cag_bytes = None
+            self._cag_string = None
+            self._cag_summary = None
+
             logger.info(f"BigQuery에서 판례 메타데이터 로드 중... ({self.project_id}.{self.dataset_id}.{self.table_id})")
             query_job = self.bq_client.query(query)
             rows = query_job.result()
 
-            self.cag_data = []
-            for row in rows:
-                case_summary = {
-                    "case_id": str(row.case_id) if row.case_id else "",
-                    "case_number": str(row.case_number) if row.case_number else "",
-                    "fault_type": str(row.fault_type) if row.fault_type else "Unknown",
-                    "alimony_amount": int(row.alimony_amount) if row.alimony_amount else 0,
-                    "property_ratio_plaintiff": float(row.property_ratio_plaintiff) if row.property_ratio_plaintiff else 0.0,
-                    "marriage_duration_years": int(row.marriage_duration_years) if row.marriage_duration_years else -1,
-                    "summary": str(row.summary)[:200] if row.summary else ""  # 요약만 포함 (토큰 절감)
+            if rows.total_rows is not None and rows.total_rows >= ARROW_MIN_ROWS:
+                try:
+                    cag_data = self._cases_from_arrow(rows)
+                except Exception as e:
+                    # Storage API/db-dtypes 문제 등으로 Arrow 변환이 실패해도 CAG 로드는 행 단위로 계속
+                    logger.warning(f"Arrow 변환 실패, 행 단위로 CAG 메타데이터를 변환합니다: {e}")
+                    cag_data = None
+                    # 실패한 to_arrow가 일부 읽었을 수 있으므로 결과 iterator를 새로 받음
+                    rows = query_job.result()
+                if cag_data is not None:
+                    self.cag_data = cag_data
+                    logger.info(f"✅ BigQuery CAG 로드 완료 (Arrow): {len(self.cag_data)}개 판례")
+                    return len(self.cag_data) > 0
+
+            # 스키마(scripts/precedent_cases_schema.sql)상 BigQuery가 이미 str/int/float로 반환하므로
+            # 재변환 없이 비어 있는 값만 기본값으로 대체
+            self.cag_data = [
+                {
+                    "case_id": row.case_id or "",
+                    "case_number": row.case_number or "",
+                    "fault_type": row.fault_type or "Unknown",
+                    "alimony_amount": row.alimony_amount or 0,
+                    "property_ratio_plaintiff": row.property_ratio_plaintiff or 0.0,
+                    "marriage_duration_years": row.marriage_duration_years or -1,
+                    "summary": (row.summary or "")[:SUMMARY_MAX_CHARS],  # 요약만 포함 (토큰 절감)
                 }
-                self.cag_data.append(case_summary)
+                for row in rows
+            ]
 
             logger.info(f"✅ BigQuery CAG 로드 완료: {len(self.cag_data)}개 판례")
             return len(self.cag_data) > 0
@@ -81,9 +123,73 @@ class PrecedentCAGLoader:
             logger.error(f"BigQuery 메타데이터 로드 실패: {str(e)}")
             return False
 
+    @staticmethod
+    def _cases_from_arrow(rows) -> Optional[List[Dict[str, Any]]]:
+        """
+        BigQuery Storage API로 결과를 Arrow 테이블로 받아 컬럼 단위로 변환
+
+        Args:
+            rows: query_job.result()의 RowIterator
+
+        Returns:
+            판례 딕셔너리 리스트 (pyarrow가 없으면 None → 행 단위 경로 사용)
+
+        Raises:
+            to_arrow/컬럼 변환 실패 시 예외 (호출 측에서 행 단위 경로로 대체)
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            logger.info("pyarrow 미설치: 행 단위로 CAG 메타데이터를 변환합니다.")
+            return None
+
+        table = rows.to_arrow(create_bqstorage_client=True)
+
+        def column(name: str, arrow_type: "pa.DataType", default: Any) -> List[Any]:
+            return pc.fill_null(pc.cast(table[name], arrow_type), default).to_pylist()
+
+        summaries = pc.utf8_slice_codeunits(
+            pc.cast(table["summary"], pa.string()), 0, SUMMARY_MAX_CHARS
+        )
+        columns = {
+            "case_id": column("case_id", pa.string(), ""),
+            "case_number": column("case_number", pa.string(), ""),
+            "fault_type": column("fault_type", pa.string(), "Unknown"),
+            "alimony_amount": column("alimony_amount", pa.int64(), 0),
+            "property_ratio_plaintiff": column("property_ratio_plaintiff", pa.float64(), 0.0),
+            "marriage_duration_years": column("marriage_duration_years", pa.int64(), -1),
+            "summary": pc.fill_null(summaries, "").to_pylist(),
+        }
+        keys = tuple(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+    def get_cag_bytes(self) -> Optional[bytes]:
+        """
+        Gemini 프롬프트 주입용 CAG를 UTF-8 JSON bytes로 반환 (로드 후 한 번만 직렬화)
+
+        Returns:
+            JSON 포맷의 CAG 메타데이터 bytes (메타데이터가 없으면 None)
+        """
+        if not self.cag_data:
+            return None
+
+        if self._cag_bytes is None:
+            # 51개 판례를 JSON 배열로 포맷 (orjson은 비ASCII 문자를 그대로 UTF-8로 출력)
+            self._cag_bytes = orjson.dumps(
+                {
+                    "precedent_count": len(self.cag_data),
+                    "cases": self.cag_data,
+                    "note": "이 메타데이터는 Context Cache를 통해 모든 사용자가 공유합니다."
+                },
+                option=orjson.OPT_INDENT_2,
+            )
+
+        return self._cag_bytes
+
     def get_cag_string(self) -> str:
         """
-        Gemini 프롬프트 주입용 CAG 문자열 생성
+        Gemini 프롬프트 주입용 CAG 문자열 생성 (get_cag_bytes의 str 버전)
 
         Returns:
             JSON 포맷의 CAG 메타데이터 문자열
@@ -91,18 +197,10 @@ class PrecedentCAGLoader:
         if not self.cag_data:
             return "메타데이터가 로드되지 않았습니다."
 
-        # 51개 판례를 JSON 배열로 포맷
-        cag_json = json.dumps(
-            {
-                "precedent_count": len(self.cag_data),
-                "cases": self.cag_data,
-                "note": "이 메타데이터는 Context Cache를 통해 모든 사용자가 공유합니다."
-            },
-            ensure_ascii=False,
-            indent=2
-        )
+        if self._cag_string is None:
+            self._cag_string = self.get_cag_bytes().decode()
 
-        return cag_json
+        return self._cag_string
 
     def get_cag_summary(self) -> str:
         """
@@ -114,42 +212,34 @@ class PrecedentCAGLoader:
         if not self.cag_data:
             return "메타데이터가 로드되지 않았습니다."
 
-        # 요약 모드: 각 판례의 핵심 정보만
-        summary_lines = [
-            f"# 51개 판례 메타데이터 (Context Cache)\n",
-        ]
-
-        for i, case in enumerate(self.cag_data, 1):
-            summary_lines.append(
-                f"{i}. Case #{case['case_id']}: "
-                f"위자료={case['alimony_amount']:,}원, "
-                f"유책사유={case['fault_type']}, "
-                f"혼인기간={case['marriage_duration_years']}년"
+        if self._cag_summary is None:
+            # 요약 모드: 각 판례의 핵심 정보만
+            self._cag_summary = CAG_SUMMARY_HEADER + "\n".join(
+                _format_case(i, case) for i, case in enumerate(self.cag_data, 1)
             )
-
-        return "\n".join(summary_lines)
+        return self._cag_summary
 
     @staticmethod
-    def create_and_load() -> Optional[str]:
+    def create_and_load() -> Optional[bytes]:
         """
-        CAG 로더를 생성하고 메타데이터를 로드한 후 CAG 문자열 반환 (편의 메서드)
+        CAG 로더를 생성하고 메타데이터를 로드한 후 CAG bytes 반환 (편의 메서드)
 
         Returns:
-            CAG 메타데이터 문자열 또는 None
+            UTF-8 JSON 형식의 CAG 메타데이터 bytes 또는 None
         """
         loader = PrecedentCAGLoader()
         if loader.load_metadata():
-            return loader.get_cag_string()
+            return loader.get_cag_bytes()
         return None
 
 
-def load_precedent_cag() -> Optional[str]:
+def load_precedent_cag() -> Optional[bytes]:
     """
     판례 CAG 로드 함수
 
     서버 시작시 이 함수를 호출하여 CAG를 로드합니다.
 
     Returns:
-        CAG 메타데이터 문자열 또는 None
+        UTF-8 JSON 형식의 CAG 메타데이터 bytes 또는 None
     """
     return PrecedentCAGLoader.create_and_load()
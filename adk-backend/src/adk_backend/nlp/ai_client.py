@@ -1,5 +1,5 @@
 import os
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from enum import Enum
 import logging
 from .gemini_client import GeminiClient
@@ -68,7 +68,7 @@ class AIClient:
         
         return await client.generate_completion(prompt_type, **kwargs)
     
-    def interpret_result(
+    async def interpret_result(
         self, 
         query: str, 
         sql: str, 
@@ -80,9 +80,24 @@ class AIClient:
             logger.error("No AI client available for result interpretation")
             return None
         
-        return client.interpret_result(query, sql, result)
+        return await client.interpret_result(query, sql, result)
     
-    def recommend_chart(
+    async def stream_interpret_result(
+        self,
+        query: str,
+        sql: str,
+        result: List[Dict[str, Any]]
+    ) -> AsyncIterator[str]:
+        """결과 해석 스트리밍"""
+        client = self.get_current_client()
+        if not client:
+            logger.error("No AI client available for result interpretation")
+            return
+
+        async for text in client.stream_interpret_result(query, sql, result):
+            yield text
+    
+    async def recommend_chart(
         self, 
         query: str, 
         columns: List[str], 
@@ -94,7 +109,7 @@ class AIClient:
             logger.error("No AI client available for chart recommendation")
             return None
         
-        result = client.recommend_chart(query, columns, data_types)
+        result = await client.recommend_chart(query, columns, data_types)
         if result:
             result["provider"] = self.current_provider
         return result
@@ -1,32 +1,192 @@
 import os
-import json
-from typing import Dict, List, Optional, Any
+import asyncio
+import threading
+import time
+import hashlib
+import random
+import unicodedata
+from functools import cached_property
+from string import Formatter
+from types import MappingProxyType
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Any, Tuple, Union
 import logging
+import orjson
+import google.auth
+from google.api_core import exceptions as google_exceptions
 import google.generativeai as genai
+from google.generativeai import caching
 from google.cloud import bigquery
 from .prompt_templates import PromptType, PromptTemplate
+from .local_entity_extractor import extract_entities
 
 logger = logging.getLogger(__name__)
 
+# Gemini 명시적 캐시에 올릴 수 있는 최소 토큰 수 (이보다 짧은 정적 프롬프트는 캐시하지 않음)
+EXPLICIT_CACHE_MIN_TOKENS = 2048
+# 만료까지 이 시간 이내로 남으면 사용 시점에 TTL 연장
+EXPLICIT_CACHE_REFRESH_MARGIN = timedelta(minutes=1)
+# embed_content 한 번에 보낼 최대 텍스트 수
+EMBEDDING_BATCH_SIZE = 100
+# 이 온도 이하의 (거의 결정적인) 템플릿만 응답을 프로세스 내에 캐시
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.1
+RESPONSE_CACHE_TTL = 3600.0
+RESPONSE_CACHE_SIZE = 10_000
+# 일시적 오류(429 Too Many Requests, 503 Service Unavailable) 재시도 설정
+RETRYABLE_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.ServiceUnavailable)
+GEMINI_RETRY_ATTEMPTS = 3
+GEMINI_RETRY_BASE_DELAY = 1.0
+GEMINI_RETRY_MAX_DELAY = 10.0
+
+
+def _compile_user_template(user_template: str) -> Callable[..., str]:
+    """
+    user_template을 한 번만 파싱해 리터럴과 필드를 이어 붙이는 렌더러로 컴파일
+
+    서식 지정자/변환(`{x:>3}`, `{x!r}`)이나 속성/인덱스 접근이 있는 템플릿은 str.format을 그대로 사용합니다.
+    """
+    parts: List[Tuple[str, Optional[str]]] = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(user_template):
+        if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+            return user_template.format
+        parts.append((literal, field_name))
+
+    # 필드가 하나뿐인 흔한 경우 ("... {query}")는 앞뒤 문자열 연결만 수행
+    if len(parts) == 1 and parts[0][1] is not None:
+        prefix, name = parts[0]
+        return lambda **kwargs: prefix + str(kwargs[name])
+    if len(parts) == 2 and parts[0][1] is not None and parts[1][1] is None:
+        (prefix, name), (suffix, _) = parts
+        return lambda **kwargs: prefix + str(kwargs[name]) + suffix
+
+    def render(**kwargs: Any) -> str:
+        return "".join(
+            literal + str(kwargs[name]) if name is not None else literal
+            for literal, name in parts
+        )
+    return render
+
+
+def _first_json_object(text: str) -> Optional[str]:
+    """text에서 처음으로 중괄호 깊이가 0으로 닫히는 JSON 객체 문자열 (아직 닫히지 않았으면 None)"""
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+async def _iter_stream_text(response: Any):
+    """스트리밍 응답의 청크 텍스트를 순서대로 반환 (텍스트가 없는 청크는 건너뜀)"""
+    async for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:
+            # 안전 필터 등으로 parts가 비어 있는 청크
+            continue
+        if text:
+            yield text
+
+
+async def _close_stream(response: Any) -> None:
+    """끝까지 읽지 않은 스트리밍 응답을 닫아 남은 생성이 백그라운드에서 이어지지 않도록 함
+
+    SDK 응답 객체는 공개 close API가 없어 하부 iterator를 직접 닫습니다 (참조가 끊긴 gRPC 호출은 취소됨).
+    """
+    iterator = getattr(response, "_iterator", None)
+    cancel = getattr(iterator, "cancel", None)
+    if callable(cancel):
+        cancel()
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception as e:
+            logger.debug("Failed to close Gemini stream: %s", e)
+
+
+class _CompiledPrompt(NamedTuple):
+    """GeminiClient가 템플릿별로 한 번만 만들어 두는 요청 불변 데이터"""
+    # 시스템 메시지 + (CAG) + 예시를 이어 붙인 정적 프롬프트 앞부분
+    static_prefix: str
+    # user_template을 미리 파싱해 둔 렌더러
+    render_user: Callable[..., str]
+    # max_tokens/temperature로 만든 GenerationConfig
+    gen_config: Any
+
+
+def _format_examples(examples: List[Dict[str, str]]) -> str:
+    """few-shot 예시 블록"""
+    return "예시:\n" + "".join(
+        f"입력: {example['input']}\n출력: {example['output']}\n\n" for example in examples
+    )
+
+
 class GeminiClient:
     """Google Gemini API 클라이언트 클래스"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.5-flash", cag_metadata: Optional[str] = None, enable_cag_caching: bool = False, cag_cache_ttl_minutes: int = 60):
+    # 안전 설정 완화 (데이터 분석/쿼리 생성 목적, 모든 요청이 공유하는 읽기 전용 매핑)
+    SAFETY_SETTINGS = MappingProxyType({
+        genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH: genai.types.HarmBlockThreshold.BLOCK_NONE,
+        genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+        genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+        genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+    })
+
+    # CAG 판례 메타데이터를 정적 앞부분/명시적 캐시에 넣는 PromptType (판례 조회 결과를 해석하는 프롬프트만)
+    CAG_PROMPT_TYPES = frozenset({PromptType.RESULT_INTERPRETATION})
+
+    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.5-flash", cag_metadata: Optional[Union[bytes, str]] = None, enable_cag_caching: bool = False, cag_cache_ttl_minutes: int = 60, enable_explicit_cache: bool = False, max_concurrency: int = 8):
         """
         Gemini 클라이언트 초기화
 
         Args:
             api_key: Google API 키 (환경변수에서 자동 로드)
             model: 사용할 모델명
-            cag_metadata: Context Cache용 판례 메타데이터 JSON (middleware에서 주입)
+            cag_metadata: Context Cache용 판례 메타데이터 JSON (middleware에서 UTF-8 bytes로 주입, str도 허용)
             enable_cag_caching: 암시적 캐싱 활성화 여부 (기본값: False)
             cag_cache_ttl_minutes: CAG 캐시 TTL in minutes (기본값: 60)
+            enable_explicit_cache: 정적 프롬프트를 Gemini 명시적 캐시에 올릴지 여부 (기본값: False)
+            max_concurrency: 일괄 요청 시 Gemini 동시 호출 상한 (RPM 쿼터 보호, 기본값: 8)
         """
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         self.model_name = model
-        self.cag_metadata = cag_metadata if enable_cag_caching else None  # 캐싱 비활성화 시 메타데이터 미주입
+        # 캐싱 비활성화 시 메타데이터 미주입
+        if not enable_cag_caching or cag_metadata is None:
+            cag_metadata = None
+            self.cag_metadata_size_bytes = 0
+        elif isinstance(cag_metadata, bytes):
+            self.cag_metadata_size_bytes = len(cag_metadata)
+            cag_metadata = cag_metadata.decode()
+        else:
+            self.cag_metadata_size_bytes = len(cag_metadata.encode())
+        # 프롬프트 조립용 str 뷰 (로드 시 한 번만 디코딩하고, 정적 앞부분에 한 번만 이어 붙임)
+        self.cag_metadata: Optional[str] = cag_metadata
         self.enable_cag_caching = enable_cag_caching  # 암시적 캐싱 활성화 여부
         self.cag_cache_ttl_minutes = cag_cache_ttl_minutes  # 캐시 TTL (분)
+        self.max_concurrency = max_concurrency
+        # 모든 Gemini 생성 호출이 공유하는 동시 요청 상한
+        self._inflight_sem = asyncio.Semaphore(max_concurrency)
 
         if not self.api_key:
             logger.warning("Google API key not found. Some features will be limited.")
@@ -36,17 +196,47 @@ class GeminiClient:
             self.model = genai.GenerativeModel(self.model_name)
 
         self.prompt_templates = self._load_prompt_templates()
-        self.bq_client = bigquery.Client() if self._should_init_bq() else None
+        # 클라이언트별 설정(CAG 등)에 따라 달라지므로 공유 템플릿이 아니라 클라이언트가 보관
+        self._compiled_prompts: Dict[PromptType, _CompiledPrompt] = {
+            prompt_type: self._compile_prompt(prompt_type, template)
+            for prompt_type, template in self.prompt_templates.items()
+        }
 
-    def _should_init_bq(self) -> bool:
-        """BigQuery 클라이언트 초기화 가능 여부 확인"""
+        # PromptType별 명시적 캐시 핸들과 캐시를 참조하는 모델
+        self.enable_explicit_cache = enable_explicit_cache
+        self._cached_contents: Dict[PromptType, Any] = {}
+        self._cached_models: Dict[PromptType, Any] = {}
+        # 진행 중인 TTL 연장 태스크 (PromptType당 하나)
+        self._cache_refreshes: Dict[PromptType, asyncio.Task] = {}
+        if self.model is not None and enable_explicit_cache:
+            self._init_explicit_cache()
+
+        # 저온 템플릿 응답 캐시: (PromptType, 사용자 메시지 해시) -> (만료 시각, 응답)
+        self._response_cache: "OrderedDict[Tuple[PromptType, bytes], Tuple[float, str]]" = OrderedDict()
+        self._response_cache_hits = 0
+        self._response_cache_misses = 0
+
+    @cached_property
+    def bq_client(self) -> Optional[bigquery.Client]:
+        """BigQuery 클라이언트 (처음 사용할 때 한 번만 생성, 실패 시 None 캐시)"""
+        if not self._should_init_bq():
+            return None
         try:
-            # 간단한 test: BigQuery 클라이언트 생성 가능한지 확인
-            client = bigquery.Client()
-            client.get_dataset("divorce_analytics")
-            return True
+            return bigquery.Client()
         except Exception as e:
             logger.warning(f"BigQuery client initialization failed: {e}")
+            return None
+
+    @staticmethod
+    def _should_init_bq() -> bool:
+        """BigQuery 클라이언트 초기화 가능 여부 확인 (클라이언트를 만들지 않고 자격 증명만 확인)"""
+        if os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
+            return True
+        try:
+            google.auth.default()
+            return True
+        except Exception as e:
+            logger.warning(f"BigQuery credentials not found: {e}")
             return False
 
 
@@ -148,9 +338,124 @@ SQL 쿼리 결과를 사용자가 이해하기 쉽게 설명해주세요.
                 temperature=0.2
             )
         }
-        
+
         return templates
+
+    def _compile_prompt(self, prompt_type: PromptType, template: PromptTemplate) -> _CompiledPrompt:
+        # 암시적 캐시는 앞부분이 바이트 단위로 같아야 적중하므로 정적 부분을 한 번만 만들어 재사용
+        return _CompiledPrompt(
+            static_prefix=self._build_static_prefix(prompt_type, template),
+            render_user=_compile_user_template(template.user_template),
+            gen_config=genai.types.GenerationConfig(
+                max_output_tokens=template.max_tokens,
+                temperature=template.temperature
+            ),
+        )
+
+    def _cag_block(self, prompt_type: PromptType) -> Optional[str]:
+        """CAG_PROMPT_TYPES에 속하고 CAG 캐싱이 켜진 경우에만 판례 메타데이터 반환"""
+        if self.cag_metadata and prompt_type in self.CAG_PROMPT_TYPES:
+            return self.cag_metadata
+        return None
+
+    def _build_static_prefix(self, prompt_type: PromptType, template: PromptTemplate) -> str:
+        """요청마다 바뀌지 않는 프롬프트 앞부분 (요청별 값은 절대 넣지 않음)"""
+        blocks = [template.system_message.strip(), "\n\n"]
+        cag = self._cag_block(prompt_type)
+        if cag:
+            blocks.append(f"판례 메타데이터 (CAG):\n{cag}\n\n")
+        if template.examples:
+            blocks.append(_format_examples(template.examples))
+        return unicodedata.normalize("NFC", "".join(blocks))
     
+    def _static_contents(self, prompt_type: PromptType, template: PromptTemplate) -> List[str]:
+        """명시적 캐시에 넣을 정적 컨텐츠 (CAG 대상 타입은 메타데이터 + 예시, 시스템 메시지는 system_instruction으로 전달)"""
+        contents: List[str] = []
+        cag = self._cag_block(prompt_type)
+        if cag:
+            contents.append(cag)
+        if template.examples:
+            contents.append(_format_examples(template.examples))
+        return contents
+
+    def _init_explicit_cache(self) -> None:
+        """정적 프롬프트가 EXPLICIT_CACHE_MIN_TOKENS 이상인 PromptType만 Gemini 명시적 캐시 생성"""
+        ttl = timedelta(minutes=self.cag_cache_ttl_minutes)
+        for prompt_type, template in self.prompt_templates.items():
+            contents = self._static_contents(prompt_type, template)
+            if not contents:
+                continue
+            try:
+                token_count = self.model.count_tokens([template.system_message, *contents]).total_tokens
+                if token_count < EXPLICIT_CACHE_MIN_TOKENS:
+                    logger.info(
+                        "명시적 캐시 생략 (%s: %d 토큰 < %d)",
+                        prompt_type.value, token_count, EXPLICIT_CACHE_MIN_TOKENS,
+                    )
+                    continue
+                cached = caching.CachedContent.create(
+                    model=self.model_name,
+                    display_name=f"divorce-{prompt_type.value}",
+                    system_instruction=template.system_message,
+                    contents=contents,
+                    ttl=ttl,
+                )
+            except Exception as e:
+                logger.warning(f"명시적 캐시 생성 실패 ({prompt_type.value}): {e}")
+                continue
+
+            self._cached_contents[prompt_type] = cached
+            self._cached_models[prompt_type] = genai.GenerativeModel.from_cached_content(cached_content=cached)
+            logger.info(f"✅ 명시적 캐시 생성: {prompt_type.value} ({token_count} 토큰, TTL {self.cag_cache_ttl_minutes}분)")
+
+    def _get_cached_model(self, prompt_type: PromptType) -> Optional[Any]:
+        """명시적 캐시 모델 반환 (만료가 임박하면 백그라운드에서 TTL 연장, 이미 만료됐으면 사용 안 함)"""
+        cached = self._cached_contents.get(prompt_type)
+        if cached is None:
+            return None
+        remaining = cached.expire_time - datetime.now(timezone.utc)
+        if remaining < EXPLICIT_CACHE_REFRESH_MARGIN and prompt_type not in self._cache_refreshes:
+            # update()는 블로킹 네트워크 호출이므로 이벤트 루프 밖에서 실행하고 요청은 기다리지 않음
+            self._cache_refreshes[prompt_type] = asyncio.get_running_loop().create_task(
+                self._refresh_cache_ttl(prompt_type, cached)
+            )
+        if remaining <= timedelta(0):
+            return None
+        return self._cached_models.get(prompt_type)
+
+    async def _refresh_cache_ttl(self, prompt_type: PromptType, cached: Any) -> None:
+        """명시적 캐시 TTL 연장 (실패 시 해당 PromptType은 캐시 사용 중단)"""
+        try:
+            await asyncio.to_thread(cached.update, ttl=timedelta(minutes=self.cag_cache_ttl_minutes))
+        except Exception as e:
+            logger.warning("명시적 캐시 TTL 연장 실패 (%s): %s", prompt_type.value, e)
+            self._cached_contents.pop(prompt_type, None)
+            self._cached_models.pop(prompt_type, None)
+        finally:
+            self._cache_refreshes.pop(prompt_type, None)
+
+    def _select_model(
+        self,
+        prompt_type: PromptType,
+        compiled: _CompiledPrompt,
+        user_message: str,
+    ) -> Tuple[Any, str]:
+        """명시적 캐시가 있으면 질문 부분만, 없으면 전체 프롬프트를 기본 모델로 전송"""
+        cached_model = self._get_cached_model(prompt_type)
+        if cached_model is not None:
+            return cached_model, f"질문: {user_message}\n답변:"
+        return self.model, self._format_prompt_for_gemini(compiled, user_message)
+
+    def _log_cache_usage(self, response: Any, context: str) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[%s] cached_content_token_count=%s prompt_token_count=%s",
+                context,
+                getattr(usage, "cached_content_token_count", 0),
+                getattr(usage, "prompt_token_count", 0),
+            )
+
     def is_available(self) -> bool:
         """Gemini API 사용 가능 여부 확인"""
         return self.model is not None
@@ -165,10 +470,33 @@ SQL 쿼리 결과를 사용자가 이해하기 쉽게 설명해주세요.
         return {
             "caching_enabled": self.enable_cag_caching,
             "cache_ttl_minutes": self.cag_cache_ttl_minutes,
+            "explicit_cache_enabled": self.enable_explicit_cache,
+            "explicit_cache_prompt_types": [prompt_type.value for prompt_type in self._cached_contents],
+            "response_cache_size": len(self._response_cache),
+            "response_cache_hits": self._response_cache_hits,
+            "response_cache_misses": self._response_cache_misses,
             "cag_metadata_loaded": self.cag_metadata is not None,
-            "cag_metadata_size_bytes": len(self.cag_metadata) if self.cag_metadata else 0,
+            "cag_metadata_size_bytes": self.cag_metadata_size_bytes,
         }
 
+    def _cached_response(self, key: Tuple[PromptType, bytes]) -> Optional[str]:
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            expires_at, text = cached
+            if expires_at > time.monotonic():
+                self._response_cache.move_to_end(key)
+                self._response_cache_hits += 1
+                return text
+            del self._response_cache[key]
+        self._response_cache_misses += 1
+        return None
+
+    def _remember_response(self, key: Tuple[PromptType, bytes], text: str) -> None:
+        self._response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, text)
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
     def _collect_response_text(self, response: Any, context: str) -> Optional[str]:
         """Gemini 응답에서 텍스트를 안전하게 추출"""
         if not response:
@@ -177,74 +505,121 @@ SQL 쿼리 결과를 사용자가 이해하기 쉽게 설명해주세요.
 
         # 방법 1: response.text 속성 사용 (가장 간단)
         try:
-            if hasattr(response, 'text'):
-                text = response.text
-                if text:
-                    logger.info(f"[{context}] Successfully extracted text using response.text: {text[:100]}...")
-                    return text.strip()
-                else:
-                    logger.warning(f"[{context}] response.text exists but is empty")
+            text = response.text
+            if text:
+                logger.debug("[%s] Extracted %d characters via response.text", context, len(text))
+                return text.strip()
+            logger.warning("[%s] response.text exists but is empty", context)
         except Exception as e:
-            logger.warning(f"[{context}] Failed to access response.text: {e}")
+            logger.warning("[%s] Failed to access response.text: %s", context, e)
 
-        # 방법 2: candidates 구조 사용 (fallback)
-        logger.info(f"[{context}] Trying fallback method via candidates")
+        # 방법 2: 첫 번째 candidate의 parts 텍스트를 이어 붙임 (fallback)
         candidates = getattr(response, "candidates", None)
         if not candidates:
-            logger.warning(f"[{context}] No candidates found. Response type: {type(response)}, dir: {dir(response)[:10]}...")
+            logger.warning("[%s] No candidates found in %s", context, type(response).__name__)
             return None
 
-        logger.info(f"[{context}] Found {len(candidates)} candidate(s)")
-
         candidate = candidates[0]
-        finish_reason = getattr(candidate, 'finish_reason', 'UNKNOWN')
-        logger.info(f"[{context}] Finish reason: {finish_reason}")
-
         content = getattr(candidate, "content", None)
-        if not content:
-            logger.warning(f"[{context}] No content in candidate. Candidate type: {type(candidate)}, dir: {dir(candidate)[:10]}...")
+        parts = getattr(content, "parts", None) if content else None
+        if not parts:
+            logger.warning(
+                "[%s] No parts in candidate (finish_reason=%s)",
+                context, getattr(candidate, "finish_reason", "UNKNOWN"),
+            )
             return None
 
-        logger.info(f"[{context}] Content found: {type(content)}")
-
-        parts = getattr(content, "parts", None)
-        if parts is None:
-            logger.warning(f"[{context}] Parts is None. Content type: {type(content)}, dir: {dir(content)[:10]}...")
+        result = "".join(part.text for part in parts if getattr(part, "text", None)).strip()
+        if not result:
+            logger.warning("[%s] No text found in %d part(s)", context, len(parts))
             return None
 
-        if not parts:  # Empty list
-            logger.warning(f"[{context}] Parts list is empty (length: {len(parts)})")
-            return None
+        logger.debug(
+            "[%s] Extracted %d characters from %d part(s) of %d candidate(s)",
+            context, len(result), len(parts), len(candidates),
+        )
+        return result
+    
+    def _format_prompt_for_gemini(self, compiled: _CompiledPrompt, user_message: str) -> str:
+        """Gemini용 프롬프트 포맷팅 ([정적 앞부분][질문] 순서로 정적 부분이 항상 앞에 오도록)"""
+        return f"{compiled.static_prefix}질문: {user_message}\n답변:"
+
+    async def _call_model(
+        self,
+        model: Any,
+        prompt: str,
+        compiled: _CompiledPrompt,
+        context: str,
+        stream: bool = False
+    ) -> Any:
+        """
+        동시 요청 상한 안에서 generate_content_async 호출
 
-        logger.info(f"[{context}] Found {len(parts)} part(s)")
+        429/503 같은 일시적 오류는 지수 백오프(full jitter)로 재시도하며,
+        대기하는 동안에는 세마포어를 놓아 다른 요청이 진행되도록 합니다.
+        스트리밍은 응답을 여는 호출까지만 세마포어/재시도 대상입니다.
+        """
+        for attempt in range(GEMINI_RETRY_ATTEMPTS):
+            try:
+                async with self._inflight_sem:
+                    return await model.generate_content_async(
+                        prompt,
+                        generation_config=compiled.gen_config,
+                        safety_settings=self.SAFETY_SETTINGS,
+                        stream=stream
+                    )
+            except RETRYABLE_ERRORS as e:
+                if attempt + 1 == GEMINI_RETRY_ATTEMPTS:
+                    raise
+                delay = random.uniform(0, min(GEMINI_RETRY_MAX_DELAY, GEMINI_RETRY_BASE_DELAY * 2 ** attempt))
+                logger.warning(
+                    "[%s] Transient Gemini error (%s), retrying in %.1fs (%d/%d)",
+                    context, type(e).__name__, delay, attempt + 1, GEMINI_RETRY_ATTEMPTS - 1,
+                )
+                await asyncio.sleep(delay)
+
+    async def _run_template(self, prompt_type: PromptType, context: str, **kwargs) -> Optional[str]:
+        """
+        템플릿 렌더링 -> (응답 캐시) -> 모델 선택 -> 호출 -> 텍스트 추출의 공통 흐름
 
-        collected_parts: List[str] = []
-        for i, part in enumerate(parts):
-            text = getattr(part, "text", None)
-            logger.info(f"[{context}] Part {i}: text length = {len(text) if text else 0}")
-            if text:
-                collected_parts.append(text)
+        Returns:
+            생성된 텍스트 또는 None (재시도 후에도 실패한 경우 포함)
+        """
+        try:
+            template = self.prompt_templates[prompt_type]
+            compiled = self._compiled_prompts[prompt_type]
+            user_message = compiled.render_user(**kwargs)
+
+            # 정적 앞부분은 템플릿마다 고정이므로 사용자 메시지만으로 캐시 키를 만듦
+            cache_key = None
+            if template.temperature <= RESPONSE_CACHE_MAX_TEMPERATURE:
+                cache_key = (prompt_type, hashlib.blake2b(user_message.encode()).digest())
+                cached_text = self._cached_response(cache_key)
+                if cached_text is not None:
+                    return cached_text
+
+            model, prompt = self._select_model(prompt_type, compiled, user_message)
+            response = await self._call_model(model, prompt, compiled, context)
+            self._log_cache_usage(response, context)
+
+            result_text = self._collect_response_text(response, context)
+            if not result_text:
+                return None
+            if cache_key is not None:
+                self._remember_response(cache_key, result_text)
+            logger.info("Gemini API call successful for %s", context)
+            return result_text
 
-        if not collected_parts:
-            logger.warning(f"[{context}] No text found in any parts")
+        except Exception as e:
+            logger.error("Gemini API call failed for %s: %s", context, e)
             return None
 
-        result = "".join(collected_parts).strip()
-        logger.info(f"[{context}] Successfully extracted {len(result)} characters")
-        return result
-    
-    def _format_prompt_for_gemini(self, system_message: str, user_message: str, examples: List[Dict[str, str]] = None) -> str:
-        """Gemini용 프롬프트 포맷팅"""
-        prompt = f"{system_message}\n\n"
-        
-        if examples:
-            prompt += "예시:\n"
-            for example in examples:
-                prompt += f"입력: {example['input']}\n출력: {example['output']}\n\n"
-        
-        prompt += f"질문: {user_message}\n답변:"
-        return prompt
-    
+    async def _open_stream(self, prompt_type: PromptType, context: str, **kwargs) -> Any:
+        """템플릿을 렌더링해 스트리밍 응답을 엶 (응답 캐시는 사용하지 않음)"""
+        compiled = self._compiled_prompts[prompt_type]
+        model, prompt = self._select_model(prompt_type, compiled, compiled.render_user(**kwargs))
+        return await self._call_model(model, prompt, compiled, context, stream=True)
+
     async def generate_completion(
         self, 
         prompt_type: PromptType, 
@@ -260,155 +635,143 @@ SQL 쿼리 결과를 사용자가 이해하기 쉽게 설명해주세요.
         Returns:
             생성된 텍스트 또는 None (API 사용 불가시)
         """
+        # 정규식/사전으로 필수 엔티티를 모두 찾으면 Gemini 호출 없이 바로 반환
+        if prompt_type is PromptType.ENTITY_EXTRACTION and "query" in kwargs:
+            entities = extract_entities(kwargs["query"])
+            if entities is not None:
+                logger.debug("[%s] Resolved locally: %s", prompt_type.value, entities)
+                return orjson.dumps(entities).decode()
+
         if not self.is_available():
-            logger.warning(f"Gemini API not available for {prompt_type.value}")
+            logger.warning("Gemini API not available for %s", prompt_type.value)
             return None
-            
-        try:
-            template = self.prompt_templates[prompt_type]
-            user_message = template.user_template.format(**kwargs)
-            
-            prompt = self._format_prompt_for_gemini(
-                template.system_message, 
-                user_message, 
-                template.examples
-            )
-            
-            generation_config = genai.types.GenerationConfig(
-                max_output_tokens=template.max_tokens,
-                temperature=template.temperature
-            )
 
-            # 안전 설정 완화 (데이터 분석/쿼리 생성 목적)
-            safety_settings = {
-                genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-            }
-
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            )
+        return await self._run_template(prompt_type, prompt_type.value, **kwargs)
 
-            result_text = self._collect_response_text(response, prompt_type.value)
-            if not result_text:
-                return None
-            logger.info(f"Gemini API call successful for {prompt_type.value}")
-            return result_text
+    @staticmethod
+    def _serialize_rows(result: List[Dict[str, Any]]) -> str:
+        # 처음 5개 행만 전달 (치환 값은 다시 해석되지 않으므로 중괄호 이스케이프 불필요)
+        return orjson.dumps(result[:5], default=str).decode()
 
-        except Exception as e:
-            logger.error(f"Gemini API call failed for {prompt_type.value}: {str(e)}")
-            return None
-    
-    def interpret_result(
+    async def interpret_result(
         self, 
         query: str, 
         sql: str, 
         result: List[Dict[str, Any]]
     ) -> Optional[str]:
-        """결과 해석 (동기 버전)"""
+        """결과 해석 (비동기, Gemini 응답을 기다리는 동안 이벤트 루프를 막지 않음)"""
         if not self.is_available():
             return None
-            
+
+        return await self._run_template(
+            PromptType.RESULT_INTERPRETATION, "result_interpretation",
+            query=query, sql=sql, result=self._serialize_rows(result)
+        )
+
+    async def stream_interpret_result(
+        self,
+        query: str,
+        sql: str,
+        result: List[Dict[str, Any]]
+    ) -> AsyncIterator[str]:
+        """결과 해석 스트리밍 (생성되는 대로 텍스트 조각을 반환, 실패 시 조용히 종료)"""
+        if not self.is_available():
+            return
+
         try:
-            template = self.prompt_templates[PromptType.RESULT_INTERPRETATION]
-            serialized_result = json.dumps(result[:5], ensure_ascii=False)
-            serialized_result = serialized_result.replace('{', '{{').replace('}', '}}')
-
-            user_message = template.user_template.format(
-                query=query,
-                sql=sql,
-                result=serialized_result  # 처음 5개 행만 전달
-            )
-            
-            prompt = self._format_prompt_for_gemini(
-                template.system_message, 
-                user_message
-            )
-            
-            generation_config = genai.types.GenerationConfig(
-                max_output_tokens=template.max_tokens,
-                temperature=template.temperature
+            response = await self._open_stream(
+                PromptType.RESULT_INTERPRETATION, "result_interpretation",
+                query=query, sql=sql, result=self._serialize_rows(result)
             )
+            async for text in _iter_stream_text(response):
+                yield text
 
-            # 안전 설정 완화 (데이터 분석/쿼리 생성 목적)
-            safety_settings = {
-                genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-            }
-
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            )
-            
-            return self._collect_response_text(response, "result_interpretation")
-            
         except Exception as e:
-            logger.error(f"Result interpretation failed: {str(e)}")
-            return None
+            logger.error("Result interpretation streaming failed: %s", e)
     
-    def recommend_chart(
+    async def recommend_chart(
         self, 
         query: str, 
         columns: List[str], 
         data_types: List[str]
     ) -> Optional[Dict[str, str]]:
-        """차트 추천 (동기 버전)"""
+        """차트 추천 (비동기)"""
         if not self.is_available():
             return None
             
         try:
-            template = self.prompt_templates[PromptType.CHART_RECOMMENDATION]
-            user_message = template.user_template.format(
-                query=query,
-                columns=columns,
-                data_types=data_types
-            )
-            
-            prompt = self._format_prompt_for_gemini(
-                template.system_message, 
-                user_message
-            )
-            
-            generation_config = genai.types.GenerationConfig(
-                max_output_tokens=template.max_tokens,
-                temperature=template.temperature
+            response = await self._open_stream(
+                PromptType.CHART_RECOMMENDATION, "chart_recommendation",
+                query=query, columns=columns, data_types=data_types
             )
 
-            # 안전 설정 완화 (데이터 분석/쿼리 생성 목적)
-            safety_settings = {
-                genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-            }
-
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            )
-            
-            result = self._collect_response_text(response, "chart_recommendation")
+            # 스트리밍으로 받으면서 첫 JSON 객체가 닫히는 즉시 파싱하고 나머지 생성은 스트림을 닫아 중단
+            buffer = ""
+            early_parse = True
+            texts = _iter_stream_text(response)
+            try:
+                async for text in texts:
+                    buffer += text
+                    if early_parse and "}" in text:
+                        candidate = _first_json_object(buffer)
+                        if candidate is not None:
+                            try:
+                                return orjson.loads(candidate)
+                            except orjson.JSONDecodeError:
+                                # 잘린 텍스트가 아니라 끝까지 받은 전체 응답으로 파싱
+                                early_parse = False
+            finally:
+                await texts.aclose()
+                await _close_stream(response)
+
+            result = buffer.strip()
             if not result:
+                logger.warning("[chart_recommendation] Empty streamed response")
                 return None
             try:
-                return json.loads(result)
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse JSON from Gemini response: {result}")
+                return orjson.loads(result)
+            except orjson.JSONDecodeError:
+                logger.warning("Failed to parse JSON from Gemini response: %s", result)
                 return {"chart_type": "table", "reason": "기본 테이블 형식"}
             
         except Exception as e:
-            logger.error(f"Chart recommendation failed: {str(e)}")
+            logger.error("Chart recommendation failed: %s", e)
             return None
 
+    async def interpret_results_batch(
+        self,
+        items: List[Tuple[str, str, List[Dict[str, Any]]]],
+        max_parallel: Optional[int] = None,
+    ) -> List[Optional[str]]:
+        """
+        여러 (query, sql, result) 해석을 동시에 요청
+
+        Args:
+            items: (질문, SQL, 결과 행) 튜플 목록
+            max_parallel: 동시 요청 상한 (기본값: GEMINI_MAX_CONCURRENCY)
+
+        Returns:
+            items 순서대로의 해석 결과 (실패한 항목은 None)
+        """
+        semaphore = asyncio.Semaphore(max_parallel or self.max_concurrency)
+
+        async def interpret(query: str, sql: str, result: List[Dict[str, Any]]) -> Optional[str]:
+            async with semaphore:
+                return await self.interpret_result(query, sql, result)
+
+        results = await asyncio.gather(
+            *(interpret(query, sql, result) for query, sql, result in items),
+            return_exceptions=True,
+        )
+        interpretations: List[Optional[str]] = []
+        for item in results:
+            if isinstance(item, BaseException):
+                logger.error("Result interpretation failed: %s", item)
+                interpretations.append(None)
+            else:
+                interpretations.append(item)
+        return interpretations
+
     def get_embedding(self, text: str) -> Optional[List[float]]:
         """
         텍스트 임베딩 생성 (text-embedding-004)
@@ -419,37 +782,97 @@ SQL 쿼리 결과를 사용자가 이해하기 쉽게 설명해주세요.
         Returns:
             임베딩 벡터 (float 리스트) 또는 None
         """
+        embeddings = self.get_embeddings([text])
+        return embeddings[0] if embeddings else None
+
+    def get_embeddings(self, texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> Optional[List[List[float]]]:
+        """
+        여러 텍스트 임베딩을 batch_size개씩 묶어 한 번의 호출로 생성
+
+        Args:
+            texts: 임베딩할 텍스트 목록
+            batch_size: 요청 한 번에 보낼 텍스트 수
+
+        Returns:
+            texts 순서대로의 임베딩 벡터 목록 또는 None
+        """
         if not self.is_available():
             logger.warning("Gemini API not available for embeddings")
             return None
 
         try:
             # 줄바꿈 등 전처리
-            text = text.replace("\n", " ")
-            
-            result = genai.embed_content(
-                model="models/text-embedding-004",
-                content=text,
-                task_type="retrieval_document",
-                title="Embedding of court case"
+            contents = [text.replace("\n", " ") for text in texts]
+
+            embeddings: List[List[float]] = []
+            for start in range(0, len(contents), batch_size):
+                result = genai.embed_content(**self._embedding_request(contents[start:start + batch_size]))
+                batch = self._extract_embeddings(result)
+                if batch is None:
+                    return None
+                embeddings.extend(batch)
+            return embeddings
+
+        except Exception as e:
+            logger.error("Embedding generation failed: %s", e)
+            return None
+
+    async def get_embeddings_async(
+        self,
+        texts: List[str],
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_parallel: Optional[int] = None,
+    ) -> Optional[List[List[float]]]:
+        """get_embeddings의 비동기 버전 (배치들을 동시 요청 상한 내에서 병렬 호출)"""
+        if not self.is_available():
+            logger.warning("Gemini API not available for embeddings")
+            return None
+
+        contents = [text.replace("\n", " ") for text in texts]
+        semaphore = asyncio.Semaphore(max_parallel or self.max_concurrency)
+
+        async def embed(batch: List[str]) -> Optional[List[List[float]]]:
+            async with semaphore:
+                result = await genai.embed_content_async(**self._embedding_request(batch))
+            return self._extract_embeddings(result)
+
+        try:
+            batches = await asyncio.gather(
+                *(embed(contents[start:start + batch_size]) for start in range(0, len(contents), batch_size))
             )
-            
-            if 'embedding' in result:
-                return result['embedding']
-            else:
-                logger.warning("No embedding in result")
-                return None
-                
         except Exception as e:
-            logger.error(f"Embedding generation failed: {str(e)}")
+            logger.error("Embedding generation failed: %s", e)
             return None
 
+        if any(batch is None for batch in batches):
+            return None
+        return [embedding for batch in batches for embedding in batch]
+
+    @staticmethod
+    def _embedding_request(batch: List[str]) -> Dict[str, Any]:
+        return {
+            "model": "models/text-embedding-004",
+            "content": batch,
+            "task_type": "retrieval_document",
+            "title": "Embedding of court case",
+        }
+
+    @staticmethod
+    def _extract_embeddings(result: Dict[str, Any]) -> Optional[List[List[float]]]:
+        # content가 리스트이면 result['embedding']도 벡터 리스트로 반환됨
+        if 'embedding' in result:
+            return result['embedding']
+        logger.warning("No embedding in result")
+        return None
+
 # 전역 Gemini 클라이언트 인스턴스 (lazy initialization with CAG)
 _gemini_client_instance = None
 _cag_metadata = None
+# 동시에 첫 호출이 들어와도 클라이언트를 한 번만 생성하도록 보호
+_init_lock = threading.Lock()
 
 
-def initialize_gemini_client_with_cag(cag_metadata: Optional[str] = None) -> GeminiClient:
+def initialize_gemini_client_with_cag(cag_metadata: Optional[Union[bytes, str]] = None) -> GeminiClient:
     """
     CAG 메타데이터를 로드하여 Gemini 클라이언트 초기화
 
@@ -464,13 +887,18 @@ def initialize_gemini_client_with_cag(cag_metadata: Optional[str] = None) -> Gem
     Returns:
         초기화된 GeminiClient 인스턴스
     """
+    with _init_lock:
+        if _gemini_client_instance is not None:
+            logger.warning("Gemini 클라이언트가 이미 초기화되었습니다.")
+            return _gemini_client_instance
+        return _create_client_with_cag(cag_metadata)
+
+
+def _create_client_with_cag(cag_metadata: Optional[Union[bytes, str]]) -> GeminiClient:
+    """initialize_gemini_client_with_cag 본문 (_init_lock을 잡은 상태에서 호출)"""
     global _gemini_client_instance, _cag_metadata
     from ..config import get_settings
 
-    if _gemini_client_instance is not None:
-        logger.warning("Gemini 클라이언트가 이미 초기화되었습니다.")
-        return _gemini_client_instance
-
     # 설정에서 캐싱 활성화 여부 및 TTL 읽기
     settings = get_settings()
     enable_caching = settings.enable_cag_caching
@@ -487,9 +915,10 @@ def initialize_gemini_client_with_cag(cag_metadata: Optional[str] = None) -> Gem
             cag_metadata = load_precedent_cag()
             if cag_metadata is None:
                 logger.warning("CAG 메타데이터 로드 실패. 캐싱이 비활성화됩니다.")
-                cag_metadata = ""
+                cag_metadata = b""
         _cag_metadata = cag_metadata
-        logger.info(f"✅ CAG 메타데이터 로드 완료 (크기: {len(cag_metadata)} 바이트, TTL: {ttl_minutes}분)")
+        size_bytes = len(cag_metadata) if isinstance(cag_metadata, bytes) else len(cag_metadata.encode())
+        logger.info(f"✅ CAG 메타데이터 로드 완료 (크기: {size_bytes} 바이트, TTL: {ttl_minutes}분)")
     else:
         # 캐싱 비활성화 시 메타데이터 로드하지 않음
         logger.info("⏭️ CAG 메타데이터 로드 스킵 (캐싱 비활성화)")
@@ -499,7 +928,9 @@ def initialize_gemini_client_with_cag(cag_metadata: Optional[str] = None) -> Gem
     _gemini_client_instance = GeminiClient(
         cag_metadata=cag_metadata,
         enable_cag_caching=enable_caching,
-        cag_cache_ttl_minutes=ttl_minutes
+        cag_cache_ttl_minutes=ttl_minutes,
+        enable_explicit_cache=settings.enable_gemini_explicit_cache,
+        max_concurrency=settings.gemini_max_concurrency,
     )
 
     logger.info("✅ Gemini 클라이언트 초기화 완료")
@@ -515,18 +946,39 @@ def get_gemini_client() -> GeminiClient:
     """
     global _gemini_client_instance
 
-    if _gemini_client_instance is None:
-        # 백업: 직접 초기화 (권장하지 않음, app lifespan에서 initialize_gemini_client_with_cag() 호출 필요)
-        from ..config import get_settings
-        settings = get_settings()
-        logger.warning(
-            "⚠️  Gemini 클라이언트를 직접 초기화합니다. "
-            "app.py의 lifespan에서 initialize_gemini_client_with_cag()을 호출하는 것이 권장됩니다."
-        )
-        _gemini_client_instance = GeminiClient(
-            cag_metadata=None,
-            enable_cag_caching=settings.enable_cag_caching,
-            cag_cache_ttl_minutes=settings.cag_cache_ttl_minutes
-        )
+    # 초기화 이후에는 락 없이 바로 반환
+    instance = _gemini_client_instance
+    if instance is not None:
+        return instance
+
+    with _init_lock:
+        if _gemini_client_instance is None:
+            # 백업: 직접 초기화 (권장하지 않음, app lifespan에서 initialize_gemini_client_with_cag() 호출 필요)
+            from ..config import get_settings
+            settings = get_settings()
+            logger.warning(
+                "⚠️  Gemini 클라이언트를 직접 초기화합니다. "
+                "app.py의 lifespan에서 initialize_gemini_client_with_cag()을 호출하는 것이 권장됩니다."
+            )
+            _gemini_client_instance = GeminiClient(
+                cag_metadata=None,
+                enable_cag_caching=settings.enable_cag_caching,
+                cag_cache_ttl_minutes=settings.cag_cache_ttl_minutes,
+                enable_explicit_cache=settings.enable_gemini_explicit_cache,
+                max_concurrency=settings.gemini_max_concurrency,
+            )
 
     return _gemini_client_instance
+
+
+async def get_gemini_client_async() -> GeminiClient:
+    """
+    get_gemini_client의 비동기 버전
+
+    아직 초기화되지 않았다면 클라이언트 생성(명시적 캐시 생성 등 네트워크 호출 포함)을
+    스레드에서 수행해 이벤트 루프를 막지 않습니다.
+    """
+    instance = _gemini_client_instance
+    if instance is not None:
+        return instance
+    return await asyncio.to_thread(get_gemini_client)
@@ -0,0 +1,108 @@
+"""
+로컬 엔티티 추출기
+
+위자료 범위, 분석 기간, 유책 사유처럼 정규식/사전으로 확실하게 뽑히는 엔티티는
+Gemini 호출 없이 추출합니다. 필수 항목(유책 사유, 집계 함수)을 모두 찾은 경우에만
+결과를 반환하고, 나머지 모호한 질의는 호출 측에서 Gemini로 넘깁니다.
+"""
+import re
+from typing import Dict, Optional
+
+# 위자료 범위 (예: '2000만원 이상', '3000 만원 미만')
+_ALIMONY_RANGE_RE = re.compile(r"(\d+)\s*만\s*원\s*(이상|이하|미만|초과)")
+
+# 분석 기간 (예: '2023년 이후', '최근 3년', '최근 6개월')
+_TIME_PERIOD_RE = re.compile(
+    r"(?P<year>(?:19|20)\d{2})\s*년\s*(?P<direction>이후|이전|부터|까지)?"
+    r"|최근\s*(?P<count>\d+)\s*(?P<unit>년|개월)"
+)
+
+# 표현 -> 유책 사유 (추출 프롬프트의 분류와 동일한 이름으로 정규화)
+FAULT_TYPE_LEXICON: Dict[str, str] = {
+    "부정행위": "부정행위",
+    "외도": "부정행위",
+    "불륜": "부정행위",
+    "상간녀": "부정행위",
+    "상간남": "부정행위",
+    "상간자": "부정행위",
+    "폭언": "폭언",
+    "욕설": "폭언",
+    "폭행": "폭행",
+    "가정폭력": "폭행",
+    "도박": "도박",
+    "고부갈등": "고부갈등",
+    "고부 갈등": "고부갈등",
+    "시댁갈등": "고부갈등",
+    "시댁 갈등": "고부갈등",
+    "악의의 유기": "악의의 유기",
+}
+
+# 표현 -> 집계 함수 (같은 질의에 여러 개가 있으면 앞쪽 항목이 우선)
+AGGREGATION_LEXICON: Dict[str, str] = {
+    "몇 건": "COUNT",
+    "몇건": "COUNT",
+    "몇 개": "COUNT",
+    "몇개": "COUNT",
+    "건수": "COUNT",
+    "개수": "COUNT",
+    "재산분할": "AVG_PROPERTY_RATIO",
+    "재산 분할": "AVG_PROPERTY_RATIO",
+    "위자료": "AVG_ALIMONY",
+}
+_AGGREGATION_PRIORITY = {name: rank for rank, name in enumerate(dict.fromkeys(AGGREGATION_LEXICON.values()))}
+
+
+def _lexicon_pattern(lexicon: Dict[str, str]) -> "re.Pattern[str]":
+    # 긴 표현을 먼저 두어 '고부 갈등'이 부분 표현보다 우선 매칭되도록 함
+    return re.compile("|".join(re.escape(term) for term in sorted(lexicon, key=len, reverse=True)))
+
+
+# 사전 전체를 하나의 alternation으로 컴파일해 질의를 한 번만 훑음
+_FAULT_TYPE_RE = _lexicon_pattern(FAULT_TYPE_LEXICON)
+_AGGREGATION_RE = _lexicon_pattern(AGGREGATION_LEXICON)
+
+
+def _time_period(query: str) -> Optional[str]:
+    match = _TIME_PERIOD_RE.search(query)
+    if match is None:
+        return None
+    if match.group("year"):
+        direction = match.group("direction")
+        return f"{match.group('year')}년 {direction}" if direction else f"{match.group('year')}년"
+    return f"최근 {match.group('count')}{match.group('unit')}"
+
+
+def extract_entities(query: str) -> Optional[Dict[str, str]]:
+    """
+    질의에서 엔티티를 로컬로 추출
+
+    Args:
+        query: 사용자 질의
+
+    Returns:
+        ENTITY_EXTRACTION 프롬프트와 같은 형식의 엔티티 딕셔너리,
+        유책 사유나 집계 함수를 확정할 수 없으면 None
+    """
+    fault_match = _FAULT_TYPE_RE.search(query)
+    aggregations = {AGGREGATION_LEXICON[match.group()] for match in _AGGREGATION_RE.finditer(query)}
+    if fault_match is None or not aggregations:
+        return None
+
+    entities = {
+        "table": "precedent_cases",
+        "fault_type": FAULT_TYPE_LEXICON[fault_match.group()],
+        "aggregation": min(aggregations, key=_AGGREGATION_PRIORITY.__getitem__),
+    }
+
+    alimony_match = _ALIMONY_RANGE_RE.search(query)
+    if alimony_match is not None:
+        entities["alimony_range"] = f"{alimony_match.group(1)}만원 {alimony_match.group(2)}"
+
+    if "AVG_PROPERTY_RATIO" in aggregations:
+        entities["property_ratio"] = "재산분할"
+
+    time_period = _time_period(query)
+    if time_period is not None:
+        entities["time_period"] = time_period
+
+    return entities
@@ -14,7 +14,7 @@ class PromptType(Enum):
     CHART_RECOMMENDATION = "chart_recommendation"
 
 
-@dataclass
+@dataclass(slots=True)
 class PromptTemplate:
     """프롬프트 템플릿 클래스"""
     name: str
@@ -1,14 +1,73 @@
 from __future__ import annotations
 
-import json
 import logging
-from typing import Any, Dict, Optional
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+import orjson
 from google.adk.runners import InMemoryRunner
 from google.genai import types as genai_types
 
 logger = logging.getLogger(__name__)
 
+# Runners are stateless apart from their in-memory services, so one per (app_name, agent) is reused
+_RUNNER_CACHE: Dict[Tuple[str, int], InMemoryRunner] = {}
+# Agents are module-level singletons; the bound only guards against callers building agents per request
+RUNNER_CACHE_SIZE = 32
+
+# 이벤트 속성 로그용 probe 목록 (hasattr 대신 getattr 한 번으로 존재 여부 확인)
+_MISSING = object()
+_EVENT_ATTRS = (
+    "content",
+    "parts",
+    "text",
+    "function_name",
+    "function_call",
+    "function_response",
+    "function_args",
+)
+
+# SQL을 실행하는 BigQuery 도구 이름 (function_call 인자에서 SQL 추출 대상)
+_BQ_EXEC_TOOLS = frozenset({"bigquery_execute", "bigquery.execute"})
+
+
+def get_agent_runner(app_name: str, agent: Any) -> InMemoryRunner:
+    """Return the cached InMemoryRunner for ``agent``, creating it on first use."""
+    key = (app_name, id(agent))
+    runner = _RUNNER_CACHE.get(key)
+    # id() can be reused once an agent is garbage-collected, so confirm the cached runner's agent
+    if runner is None or runner.agent is not agent:
+        if len(_RUNNER_CACHE) >= RUNNER_CACHE_SIZE:
+            _RUNNER_CACHE.pop(next(iter(_RUNNER_CACHE)))
+        runner = _RUNNER_CACHE[key] = InMemoryRunner(app_name=app_name, agent=agent)
+    return runner
+
+
+@asynccontextmanager
+async def request_session(runner: InMemoryRunner, user_id: str, session_id: str) -> AsyncIterator[Any]:
+    """Create a fresh session for one request on a shared runner and drop it afterwards.
+
+    The stored session gets a unique id derived from ``session_id``: create_session silently
+    replaces a session with the same id, so concurrent requests reusing a caller id (e.g.
+    "default") would otherwise overwrite and delete each other's session. Every request still
+    starts from an empty history, as it did when each request built its own runner.
+    """
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name,
+        user_id=user_id,
+        session_id=f"{session_id}-{uuid.uuid4().hex}",
+    )
+    try:
+        yield session
+    finally:
+        try:
+            await runner.session_service.delete_session(
+                app_name=runner.app_name, user_id=session.user_id, session_id=session.id
+            )
+        except Exception as exc:
+            logger.debug("Failed to drop request session %s: %s", session.id, exc)
+
 
 async def run_adk_agent(
     agent: Any,
@@ -20,242 +79,274 @@ async def run_adk_agent(
     Execute a Google ADK agent with the provided user message and capture the trace.
 
     Returns:
-        Dict[str, Any]: agent_response, tool_calls, sql_query, query_result, events_count
+        Dict[str, Any]: agent_response, tool_names, tool_args_list, tool_responses
+        (parallel per-call lists), sql_query, query_result, events_count
     """
-    logger.info("=" * 100)
-    logger.info("🚀 [ADK 실행] Google ADK Agent 실행 시작")
-    logger.info("=" * 100)
+    # 레벨 확인은 요청당 한 번만 하고, 비활성화 시 이벤트별 문자열/JSON 생성을 모두 건너뜀
+    info = logger.isEnabledFor(logging.INFO)
 
-    runner = InMemoryRunner(app_name="ADK Chat", agent=agent)
-    logger.info(f"✅ [ADK] Runner 생성 완료 (agent={agent.name})")
+    if info:
+        logger.info("=" * 100)
+        logger.info("🚀 [ADK 실행] Google ADK Agent 실행 시작")
+        logger.info("=" * 100)
+
+    runner = get_agent_runner("ADK Chat", agent)
+    if info:
+        logger.info("✅ [ADK] Runner 준비 완료 (agent=%s)", agent.name)
 
     resolved_user = user_id or "web-user"
     resolved_session = session_id or f"chat-{resolved_user}"
 
-    logger.info(f"🔐 [ADK] 세션 생성 중... (user={resolved_user}, session={resolved_session})")
-    session = await runner.session_service.create_session(
-        app_name="ADK Chat",
-        user_id=resolved_user,
-        session_id=resolved_session,
-    )
-    logger.info(f"✅ [ADK] 세션 생성 완료 (user_id={session.user_id}, session_id={session.id})")
-
+    if info:
+        logger.info("🔐 [ADK] 세션 생성 중... (user=%s, session=%s)", resolved_user, resolved_session)
     message = genai_types.Content(role="user", parts=[genai_types.Part(text=user_message)])
 
     events = []
-    tool_calls = []
-    agent_response = ""
+    # 도구 호출은 이름/인자/응답을 같은 인덱스의 병렬 리스트로 보관 (호출마다 dict를 만들지 않음)
+    tool_names: List[str] = []
+    tool_args_list: List[Any] = []
+    tool_responses: List[Any] = []
+    agent_response_parts: List[str] = []
     sql_query = None
     query_result = None
 
-    logger.info("")
-    logger.info("-" * 100)
-    logger.info(f"📨 [ADK 메시지] {user_message}")
-    logger.info("-" * 100)
-    logger.info("🔄 [ADK] Agent 실행 시작... 이벤트 수신 대기 중...")
-    logger.info("-" * 100)
-
-    event_count = 0
-    async for event in runner.run_async(
-        user_id=session.user_id,
-        session_id=session.id,
-        new_message=message,
-    ):
-        event_count += 1
-        events.append(event)
-
-        event_type = getattr(event, "__class__", type(event)).__name__
+    if info:
         logger.info("")
-        logger.info(f"🎯 [ADK 이벤트 #{event_count}] 타입: {event_type}")
-
-        event_attrs = []
-        for attr in [
-            "content",
-            "parts",
-            "text",
-            "function_name",
-            "function_call",
-            "function_response",
-            "function_args",
-        ]:
-            if hasattr(event, attr):
-                event_attrs.append(attr)
-        if event_attrs:
-            logger.info(f"   📋 속성: {', '.join(event_attrs)}")
-
-        if hasattr(event, "content") and event.content:
-            content = event.content
-            logger.info(f"   📦 Content 상세:")
-            logger.info(f"      - Role: {getattr(content, 'role', 'N/A')}")
-            if hasattr(content, "parts") and content.parts:
-                logger.info(f"      - Parts 개수: {len(content.parts)}")
-                for part_idx, part in enumerate(content.parts, 1):
-                    part_type = type(part).__name__
-                    logger.info(f"      - Part #{part_idx}: {part_type}")
-
-                    if hasattr(part, "text") and part.text:
-                        logger.info(f"         * text ({len(part.text)}자): {part.text[:100]}...")
-
-                    if hasattr(part, "function_call"):
-                        fc = part.function_call
-                        tool_name = getattr(fc, "name", None) or "unknown_tool"
-                        tool_args = getattr(fc, "args", {})
-                        role = getattr(content, "role", None)
-
-                        logger.info(f"         * function_call: {tool_name}")
-                        if tool_args:
-                            logger.info(f"         * args: {tool_args}")
-
-                        if role == "model" and tool_name != "unknown_tool":
-                            logger.info("")
-                            logger.info(f"🛠️  [ADK 도구 호출 #{len(tool_calls) + 1}]")
-                            logger.info(f"   📌 도구명: {tool_name}")
-                            logger.info(f"   📝 전체 인자:")
-                            logger.info(f"   {json.dumps(tool_args, indent=6, ensure_ascii=False)}")
-
-                            tool_calls.append(
-                                {
-                                    "tool_name": tool_name,
-                                    "args": tool_args,
-                                }
-                            )
-                        elif tool_name == "unknown_tool":
-                            logger.debug(f"         ⏭️  Internal event (unknown_tool, role={role}) - skipped")
-
-                        if (
-                            role == "model"
-                            and tool_name in ["bigquery_execute", "bigquery.execute"]
-                            and "sql" in tool_args
-                        ):
-                            if not sql_query:
-                                sql_query = tool_args["sql"]
-                                logger.info("")
-                                logger.info("💾 [SQL 쿼리 추출 - function_call에서]")
-                                logger.info("   📜 SQL:")
-                                logger.info(sql_query)
-                                logger.info("")
-
-                    if hasattr(part, "function_response"):
-                        fr = part.function_response
-                        logger.info("         * function_response 존재")
-
-                        response_data = None
-                        if hasattr(fr, "response"):
-                            response_data = fr.response
-                        elif isinstance(fr, dict):
-                            response_data = fr
-                        elif isinstance(fr, str):
-                            try:
-                                response_data = json.loads(fr)
-                            except Exception:
-                                response_data = fr
-
-                        if response_data:
-                            logger.info("")
-                            logger.info("📥 [ADK 도구 응답 수신]")
-                            logger.info(f"   📝 응답 타입: {type(response_data).__name__}")
-
-                            response_str = str(response_data)
-                            if len(response_str) > 500:
-                                logger.info("   📄 응답 내용 (처음 500자):")
-                                logger.info(f"   {response_str[:500]}...")
-                                logger.info(f"   ... (총 {len(response_str)}자)")
-                            else:
-                                logger.info("   📄 응답 내용:")
-                                logger.info(f"   {response_str}")
-
-                            if isinstance(response_data, str):
-                                try:
-                                    response_data = json.loads(response_data)
-                                    logger.info("   ✅ JSON 파싱 성공")
-                                    logger.info(
-                                        f"   📊 JSON 키: {list(response_data.keys()) if isinstance(response_data, dict) else 'N/A'}"
-                                    )
-                                except json.JSONDecodeError as exc:
-                                    logger.warning(f"   ⚠️  JSON 파싱 실패: {exc}")
-
-                            if isinstance(response_data, dict):
-                                if "rows" in response_data:
-                                    query_result = response_data["rows"]
-                                    row_count = (
-                                        len(query_result)
-                                        if isinstance(query_result, list)
-                                        else "N/A"
-                                    )
-                                    logger.info("📊 [쿼리 결과 추출 성공]")
-                                    logger.info(f"   📈 행 개수: {row_count}")
-                                    if isinstance(query_result, list) and query_result:
-                                        logger.info("   📝 첫 번째 행 샘플:")
+        logger.info("-" * 100)
+        logger.info("📨 [ADK 메시지] %s", user_message)
+        logger.info("-" * 100)
+        logger.info("🔄 [ADK] Agent 실행 시작... 이벤트 수신 대기 중...")
+        logger.info("-" * 100)
+
+    async with request_session(runner, resolved_user, resolved_session) as session:
+        if info:
+            logger.info("✅ [ADK] 세션 생성 완료 (user_id=%s, session_id=%s)", session.user_id, session.id)
+
+        event_count = 0
+        async for event in runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=message,
+        ):
+            event_count += 1
+            events.append(event)
+
+            if info:
+                logger.info("")
+                logger.info("🎯 [ADK 이벤트 #%d] 타입: %s", event_count, type(event).__name__)
+
+                event_attrs = [attr for attr in _EVENT_ATTRS if getattr(event, attr, _MISSING) is not _MISSING]
+                if event_attrs:
+                    logger.info("   📋 속성: %s", ", ".join(event_attrs))
+
+            # 이벤트 자체에 text가 있으면 그것만 응답으로 쓰고, 없으면 파트 텍스트를 아래 루프에서 한 번에 누적
+            event_text = getattr(event, "text", None)
+            content = getattr(event, "content", None)
+            if content:
+                if info:
+                    logger.info("   📦 Content 상세:")
+                    logger.info("      - Role: %s", getattr(content, "role", "N/A"))
+                parts = getattr(content, "parts", None)
+                if parts:
+                    if info:
+                        logger.info("      - Parts 개수: %d", len(parts))
+                    for part_idx, part in enumerate(parts, 1):
+                        text = getattr(part, "text", None)
+                        fc = getattr(part, "function_call", None)
+                        fr = getattr(part, "function_response", None)
+                        if info:
+                            logger.info("      - Part #%d: %s", part_idx, type(part).__name__)
+
+                            if text:
+                                logger.info("         * text (%d자): %.100s...", len(text), text)
+
+                        if text and not event_text:
+                            agent_response_parts.append(text)
+                            if info:
+                                logger.info("   💬 파트 #%d 텍스트 수신 (%d자): %.200s...", part_idx, len(text), text)
+
+                        if fc is not None:
+                            tool_name = getattr(fc, "name", None) or "unknown_tool"
+                            tool_args = getattr(fc, "args", {})
+                            role = getattr(content, "role", None)
+
+                            if info:
+                                logger.info("         * function_call: %s", tool_name)
+                                if tool_args:
+                                    logger.info("         * args: %s", tool_args)
+
+                            if role == "model" and tool_name != "unknown_tool":
+                                if info:
+                                    logger.info("")
+                                    logger.info("🛠️  [ADK 도구 호출 #%d]", len(tool_names) + 1)
+                                    logger.info("   📌 도구명: %s", tool_name)
+                                    logger.info("   📝 전체 인자:")
+                                    logger.info("   %s", tool_args)
+
+                                tool_names.append(tool_name)
+                                tool_args_list.append(tool_args)
+                                tool_responses.append(None)
+                            elif tool_name == "unknown_tool":
+                                logger.debug("         ⏭️  Internal event (unknown_tool, role=%s) - skipped", role)
+
+                            if (
+                                role == "model"
+                                and tool_name in _BQ_EXEC_TOOLS
+                                and "sql" in tool_args
+                            ):
+                                if not sql_query:
+                                    sql_query = tool_args["sql"]
+                                    if info:
+                                        logger.info("")
+                                        logger.info("💾 [SQL 쿼리 추출 - function_call에서]")
+                                        logger.info("   📜 SQL:")
+                                        logger.info("%s", sql_query)
+                                        logger.info("")
+
+                        if fr is not None:
+                            if info:
+                                logger.info("         * function_response 존재")
+
+                            response_data, raw_text = coerce_tool_response(fr)
+
+                            if response_data or raw_text:
+                                if info:
+                                    # 문자열 응답은 파싱 전 원문 기준으로 기록
+                                    received = raw_text if raw_text is not None else response_data
+                                    logger.info("")
+                                    logger.info("📥 [ADK 도구 응답 수신]")
+                                    logger.info("   📝 응답 타입: %s", type(received).__name__)
+                                    _log_response_preview(received)
+
+                                if raw_text is not None:
+                                    if response_data is raw_text:
+                                        logger.warning("   ⚠️  JSON 파싱 실패")
+                                    elif info:
+                                        logger.info("   ✅ JSON 파싱 성공")
                                         logger.info(
-                                            json.dumps(
-                                                query_result[0],
-                                                indent=6,
-                                                ensure_ascii=False,
-                                            )
+                                            "   📊 JSON 키: %s",
+                                            list(response_data) if isinstance(response_data, dict) else "N/A",
                                         )
-                                if tool_calls:
-                                    tool_calls[-1]["response"] = response_data
-
-                    if hasattr(part, "thought_signature"):
-                        logger.info("         * thought_signature 존재 (Agent 내부 사고)")
-
-        if hasattr(event, "text") and event.text:
-            agent_response += event.text
-            logger.info(f"   💬 텍스트 수신 ({len(event.text)}자): {event.text[:200]}...")
-        elif hasattr(event, "content") and hasattr(event.content, "parts"):
-            for part_idx, part in enumerate(event.content.parts, 1):
-                if hasattr(part, "text") and part.text:
-                    agent_response += part.text
-                    logger.info(
-                        f"   💬 파트 #{part_idx} 텍스트 수신 ({len(part.text)}자): {part.text[:200]}..."
-                    )
 
+                                if isinstance(response_data, dict):
+                                    if "rows" in response_data:
+                                        query_result = response_data["rows"]
+                                        if info:
+                                            row_count = (
+                                                len(query_result)
+                                                if isinstance(query_result, list)
+                                                else "N/A"
+                                            )
+                                            logger.info("📊 [쿼리 결과 추출 성공]")
+                                            logger.info("   📈 행 개수: %s", row_count)
+                                            if isinstance(query_result, list) and query_result:
+                                                logger.info("   📝 첫 번째 행 샘플:")
+                                                logger.info("%s", query_result[0])
+                                    if tool_responses:
+                                        tool_responses[-1] = response_data
+
+                        if info and getattr(part, "thought_signature", None) is not None:
+                            logger.info("         * thought_signature 존재 (Agent 내부 사고)")
+
+            if event_text:
+                agent_response_parts.append(event_text)
+                if info:
+                    logger.info("   💬 텍스트 수신 (%d자): %.200s...", len(event_text), event_text)
+
+    agent_response = "".join(agent_response_parts)
+    if info:
+        _log_summary(events, tool_names, agent_response, sql_query, query_result)
+
+    return {
+        "agent_response": agent_response.strip(),
+        "tool_names": tool_names,
+        "tool_args_list": tool_args_list,
+        "tool_responses": tool_responses,
+        "sql_query": sql_query,
+        "query_result": query_result,
+        "events_count": len(events),
+    }
+
+
+def coerce_tool_response(function_response: Any) -> Tuple[Any, Optional[str]]:
+    """Parse a function_response payload once.
+
+    Returns ``(parsed, raw_text)``: ``raw_text`` is the original string when the payload was a
+    string (``parsed`` is then the decoded JSON, or the string itself if it is not valid JSON),
+    otherwise ``None``.
+    """
+    raw = getattr(function_response, "response", function_response)
+    if isinstance(raw, str):
+        try:
+            return orjson.loads(raw), raw
+        except orjson.JSONDecodeError:
+            return raw, raw
+    return raw, None
+
+
+def _log_response_preview(response_data: Any, limit: int = 500) -> None:
+    """도구 응답 미리보기 로그 (dict/list는 orjson으로 직렬화해 앞부분만 디코딩)"""
+    if isinstance(response_data, (dict, list)):
+        raw = orjson.dumps(response_data, default=str)
+        preview, total, unit = raw[:limit].decode("utf-8", "replace"), len(raw), "바이트"
+    else:
+        text = response_data if isinstance(response_data, str) else str(response_data)
+        preview, total, unit = text[:limit], len(text), "자"
+
+    if total > limit:
+        logger.info("   📄 응답 내용 (처음 %d%s):", limit, unit)
+        logger.info("   %s...", preview)
+        logger.info("   ... (총 %d%s)", total, unit)
+    else:
+        logger.info("   📄 응답 내용:")
+        logger.info("   %s", preview)
+
+
+def _log_summary(
+    events: List[Any],
+    tool_names: List[str],
+    agent_response: str,
+    sql_query: Optional[str],
+    query_result: Any,
+) -> None:
+    """실행 완료 요약 로그 (INFO 활성화 시에만 호출)"""
     logger.info("")
     logger.info("=" * 100)
     logger.info("✅ [ADK 실행 완료]")
     logger.info("=" * 100)
-    logger.info(f"   📊 총 이벤트: {len(events)}개")
-    logger.info(f"   🛠️  도구 호출: {len(tool_calls)}회")
-    logger.info(f"   💬 응답 텍스트: {len(agent_response)}자")
-    logger.info(f"   💾 SQL 쿼리: {'✅ 생성됨' if sql_query else '❌ 없음'}")
-    logger.info(f"   📈 쿼리 결과: {'✅ 있음' if query_result else '❌ 없음'}")
+    logger.info("   📊 총 이벤트: %d개", len(events))
+    logger.info("   🛠️  도구 호출: %d회", len(tool_names))
+    logger.info("   💬 응답 텍스트: %d자", len(agent_response))
+    logger.info("   💾 SQL 쿼리: %s", "✅ 생성됨" if sql_query else "❌ 없음")
+    logger.info("   📈 쿼리 결과: %s", "✅ 있음" if query_result else "❌ 없음")
 
-    if tool_calls:
+    if tool_names:
         logger.info("")
         logger.info("🔧 [도구 호출 요약]")
-        for idx, tc in enumerate(tool_calls, 1):
-            logger.info(f"   {idx}. {tc['tool_name']}")
+        for idx, name in enumerate(tool_names, 1):
+            logger.info("   %d. %s", idx, name)
 
     if agent_response:
         logger.info("")
         logger.info("💬 [Agent 최종 응답]")
         if len(agent_response) > 300:
-            logger.info(f"   (처음 300자): {agent_response[:300]}...")
-            logger.info(f"   ... (총 {len(agent_response)}자)")
+            logger.info("   (처음 300자): %.300s...", agent_response)
+            logger.info("   ... (총 %d자)", len(agent_response))
         else:
-            logger.info(f"   {agent_response}")
+            logger.info("   %s", agent_response)
 
     if sql_query:
         logger.info("")
         logger.info("💾 [생성된 SQL]")
-        logger.info(sql_query)
+        logger.info("%s", sql_query)
 
     if query_result:
         result_count = len(query_result) if isinstance(query_result, list) else "N/A"
         logger.info("")
         logger.info("📊 [쿼리 결과]")
-        logger.info(f"   행 개수: {result_count}")
+        logger.info("   행 개수: %s", result_count)
         if isinstance(query_result, list) and query_result:
             logger.info("   첫 번째 행:")
-            logger.info(json.dumps(query_result[0], indent=6, ensure_ascii=False))
+            logger.info("%s", query_result[0])
 
     logger.info("=" * 100)
-
-    return {
-        "agent_response": agent_response.strip(),
-        "tool_calls": tool_calls,
-        "sql_query": sql_query,
-        "query_result": query_result,
-        "events_count": len(events),
-    }
-
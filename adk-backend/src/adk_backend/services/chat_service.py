@@ -3,19 +3,18 @@
 채팅 비즈니스 로직 서비스
 """
 
-import json
 import logging
-import asyncio
 import os
 import uuid
 import shutil
-from datetime import datetime
+import time
+from types import MappingProxyType
 from typing import List, Optional, Dict, Any, AsyncGenerator
 
+import orjson
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 from google.genai import types as genai_types
-from google.adk.runners import InMemoryRunner
 
 from ..agents import (
     divorce_case_agent,
@@ -23,7 +22,12 @@ from ..agents import (
     get_agent_info,
 )
 from ..utils.bigquery_helper import BigQueryHelper
-from ..services.adk_agent_runner import run_adk_agent
+from ..services.adk_agent_runner import (
+    coerce_tool_response,
+    get_agent_runner,
+    request_session,
+    run_adk_agent,
+)
 from ..api.schemas.chat import (
     QueryRequest, QueryResponse, ChatMessage, AgentSummary, 
     ExampleQuery, UploadResponse, FeedbackRequest, FeedbackResponse, 
@@ -40,8 +44,44 @@ from ..api.schemas.chat import (
 
 logger = logging.getLogger(__name__)
 
+# BigQuery 도구 이름 접두사 (스트림에서 SQL 이벤트를 보낼 도구 판별)
+_BQ_TOOL_PREFIXES = ("bigquery_", "bigquery.")
+
+# 요청마다 바뀌지 않는 통합 에이전트 정보는 import 시점에 한 번만 구성
+_AGENT_INFO = get_agent_info("divorce_case")
+_AGENT_METADATA = MappingProxyType({
+    "key": _AGENT_INFO.key,
+    "display_name": _AGENT_INFO.display_name,
+    "description": _AGENT_INFO.description,
+    "focus": _AGENT_INFO.focus,
+    "strengths": _AGENT_INFO.strengths,
+    "keywords": _AGENT_INFO.keywords,
+})
+_AGENT_TOOL_NAMES = tuple(
+    getattr(tool.func, "__name__", "unknown")
+    if hasattr(tool, "func") else str(tool)
+    for tool in divorce_case_agent.tools
+)
+
+PREVIEW_SAMPLE_ITEMS = 3
+
+
+def _truncate_for_preview(data: Any, depth: int = 2) -> Any:
+    """미리보기용으로 긴 리스트를 앞부분 샘플로 줄임 (dict 값은 depth 단계까지 재귀)"""
+    if isinstance(data, list):
+        if len(data) > PREVIEW_SAMPLE_ITEMS:
+            return {"__truncated_from__": len(data), "sample": data[:PREVIEW_SAMPLE_ITEMS]}
+        return data
+    if depth and isinstance(data, dict):
+        return {key: _truncate_for_preview(value, depth - 1) for key, value in data.items()}
+    return data
+
+
 def _preview_data(data: Any, limit: int = 200) -> Optional[str]:
-    """UI에 표시하기 쉬운 응답 요약 텍스트."""
+    """UI에 표시하기 쉬운 응답 요약 텍스트.
+
+    행이 많은 결과도 전체를 직렬화하지 않도록 리스트를 먼저 샘플로 줄이고, 직렬화한 bytes에서 limit 바이트만 디코딩합니다.
+    """
     if data is None:
         return None
 
@@ -52,11 +92,14 @@ def _preview_data(data: Any, limit: int = 200) -> Optional[str]:
         return data if len(data) <= limit else f"{data[:limit]}..."
 
     try:
-        serialized = json.dumps(data, ensure_ascii=False)
-    except (TypeError, ValueError):
-        serialized = str(data)
+        serialized = orjson.dumps(_truncate_for_preview(data), default=str)
+    except TypeError:
+        serialized = str(data).encode()
 
-    return serialized if len(serialized) <= limit else f"{serialized[:limit]}..."
+    if len(serialized) <= limit:
+        return serialized.decode()
+    # 멀티바이트 문자 중간에서 잘린 경우 불완전한 마지막 문자는 버림
+    return f"{serialized[:limit].decode('utf-8', 'ignore')}..."
 
 async def process_query_service(
     request: QueryRequest,
@@ -64,7 +107,7 @@ async def process_query_service(
 ) -> QueryResponse:
     """사용자 질의 처리 핵심 로직"""
     try:
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         analysis_steps: List[str] = []
         analysis_steps.append(f"질문 수신: {request.message}")
         execution_trace: List[Dict[str, Any]] = []
@@ -72,7 +115,7 @@ async def process_query_service(
         agent_metadata: Optional[Dict[str, Any]] = None
 
         logger.info("="*80)
-        logger.info(f"📨 [서비스] 사용자 질문: {request.message}")
+        logger.info("📨 [서비스] 사용자 질문: %s", request.message)
         
         # 파일 컨텍스트 추가
         effective_message = request.message
@@ -83,7 +126,6 @@ async def process_query_service(
             effective_message += file_context
 
         # 에이전트 정보 설정
-        agent_info = get_agent_info("divorce_case")
         selected_agent = divorce_case_agent
         agent_name = getattr(selected_agent, "name", "divorce_total_expert")
         agent_reason = "통합 이혼 솔루션 에이전트 자동 할당"
@@ -92,25 +134,15 @@ async def process_query_service(
         use_adk_agent = True
         effective_sql_mode = "unified"
 
-        agent_metadata = {
-            "key": agent_info.key,
-            "display_name": agent_info.display_name,
-            "description": agent_info.description,
-            "focus": agent_info.focus,
-            "strengths": agent_info.strengths,
-            "keywords": agent_info.keywords,
-        }
+        # 응답 모델에 담기는 사본 (공유 상수는 읽기 전용으로 유지)
+        agent_metadata = dict(_AGENT_METADATA)
 
         execution_trace.append({
             "phase": "agent_selection",
             "agent": agent_metadata,
             "reason": agent_reason,
             "mode": agent_mode,
-            "tools": [
-                getattr(tool.func, "__name__", "unknown")
-                if hasattr(tool, "func") else str(tool)
-                for tool in selected_agent.tools
-            ],
+            "tools": list(_AGENT_TOOL_NAMES),
         })
 
         sql_query = None
@@ -128,28 +160,26 @@ async def process_query_service(
             )
 
             # 도구 호출 정보 처리
-            if adk_result["tool_calls"]:
-                for i, tool_call in enumerate(adk_result["tool_calls"], 1):
-                    tool_name = tool_call["tool_name"]
-                    analysis_steps.append(f"🛠️  ADK 도구 #{i}: {tool_name}")
-                    response_data = tool_call.get("response")
-                    response_summary: Dict[str, Any] = {}
-                    if isinstance(response_data, dict):
-                        if "rows" in response_data:
-                            rows = response_data.get("rows", [])
-                            response_summary["row_count"] = len(rows) if isinstance(rows, list) else rows
-                        if "schema" in response_data:
-                            schema = response_data.get("schema", [])
-                            response_summary["schema_fields"] = len(schema) if isinstance(schema, list) else schema
-                    
-                    execution_trace.append({
-                        "phase": "adk_tool_call",
-                        "order": i,
-                        "tool_name": tool_name,
-                        "args": tool_call.get("args"),
-                        "response_preview": _preview_data(response_data),
-                        "response_summary": response_summary or None,
-                    })
+            tool_calls = zip(adk_result["tool_names"], adk_result["tool_args_list"], adk_result["tool_responses"])
+            for i, (tool_name, tool_args, response_data) in enumerate(tool_calls, 1):
+                analysis_steps.append(f"🛠️  ADK 도구 #{i}: {tool_name}")
+                response_summary: Dict[str, Any] = {}
+                if isinstance(response_data, dict):
+                    if "rows" in response_data:
+                        rows = response_data.get("rows", [])
+                        response_summary["row_count"] = len(rows) if isinstance(rows, list) else rows
+                    if "schema" in response_data:
+                        schema = response_data.get("schema", [])
+                        response_summary["schema_fields"] = len(schema) if isinstance(schema, list) else schema
+
+                execution_trace.append({
+                    "phase": "adk_tool_call",
+                    "order": i,
+                    "tool_name": tool_name,
+                    "args": tool_args,
+                    "response_preview": _preview_data(response_data),
+                    "response_summary": response_summary or None,
+                })
 
             # SQL 및 결과 추출
             if adk_result["sql_query"]:
@@ -184,7 +214,7 @@ async def process_query_service(
                 })
 
         except Exception as e:
-            logger.error(f"❌ [서비스] ADK 실행 오류: {e}")
+            logger.error("❌ [서비스] ADK 실행 오류: %s", e)
             analysis_steps.append(f"❌ ADK Agent 실행 실패: {str(e)}")
             use_adk_agent = False
 
@@ -195,13 +225,13 @@ async def process_query_service(
                     query_result = bq_helper.execute_query(sql_query)
                     analysis_steps.append(f"BigQuery 실행 성공: {len(query_result)}행 반환")
                 except Exception as e:
-                    logger.error(f"❌ [서비스] 쿼리 실행 오류: {e}")
+                    logger.error("❌ [서비스] 쿼리 실행 오류: %s", e)
                     analysis_steps.append(f"BigQuery 실행 실패: {str(e)}")
 
         # 차트 제안
         chart_suggestion = "table" if query_result else None
 
-        execution_time = (datetime.now() - start_time).total_seconds()
+        execution_time = time.perf_counter() - start_time
         
         return QueryResponse(
             response=response_text or "응답을 생성할 수 없습니다.",
@@ -219,7 +249,7 @@ async def process_query_service(
         )
 
     except Exception as e:
-        logger.error(f"❌ [서비스] 예상치 못한 오류: {e}")
+        logger.error("❌ [서비스] 예상치 못한 오류: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -230,11 +260,15 @@ async def stream_adk_events_service(
     user_message: str,
     user_id: str,
     session_id: str
-) -> AsyncGenerator[str, None]:
-    """SSE 스트리밍 서비스 핵심 로직"""
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """SSE 스트리밍 서비스 핵심 로직
+
+    각 이벤트는 ``{"event": 이름, "data": payload}`` 딕셔너리로 반환되며,
+    SSE 직렬화는 라우터 계층에서 수행합니다.
+    """
     try:
         agent = executor_agent_info.agent
-        logger.info(f"🚀 [SSE 서비스] 스트리밍 시작: {executor_agent_info.key}")
+        logger.info("🚀 [SSE 서비스] 스트리밍 시작: %s", executor_agent_info.key)
 
         # 시작 알림
         start_payload = {
@@ -244,112 +278,101 @@ async def stream_adk_events_service(
             "agent_display_name": display_agent_info.display_name,
             "mode": agent_mode,
         }
-        yield f"event: start\ndata: {json.dumps(start_payload, ensure_ascii=False)}\n\n"
+        yield {"event": "start", "data": start_payload}
 
-        # Runner 및 세션 설정
-        runner = InMemoryRunner(app_name="ADK Chat Stream", agent=agent)
+        # Runner 및 세션 설정 (Runner는 에이전트별로 재사용, 세션은 요청마다 새로 생성)
+        runner = get_agent_runner("ADK Chat Stream", agent)
         resolved_user = user_id or "web-user"
         resolved_session = session_id or f"chat-stream-{resolved_user}"
-        
-        session = await runner.session_service.create_session(
-            app_name="ADK Chat Stream",
-            user_id=resolved_user,
-            session_id=resolved_session,
-        )
 
-        # 에이전트 정보
-        agent_info_payload = {
-            "agent_name": agent.name if hasattr(agent, "name") else executor_agent_info.key,
-            "agent_key": display_agent_info.key,
-            "agent_display_name": display_agent_info.display_name,
-            "model": agent.model,
-            "description": display_agent_info.description,
-            "mode": agent_mode
-        }
-        yield f"event: agent_info\ndata: {json.dumps(agent_info_payload, ensure_ascii=False)}\n\n"
-
-        message = genai_types.Content(role="user", parts=[genai_types.Part(text=user_message)])
+        async with request_session(runner, resolved_user, resolved_session) as session:
+            # 에이전트 정보
+            agent_info_payload = {
+                "agent_name": agent.name if hasattr(agent, "name") else executor_agent_info.key,
+                "agent_key": display_agent_info.key,
+                "agent_display_name": display_agent_info.display_name,
+                "model": agent.model,
+                "description": display_agent_info.description,
+                "mode": agent_mode
+            }
+            yield {"event": "agent_info", "data": agent_info_payload}
+
+            message = genai_types.Content(role="user", parts=[genai_types.Part(text=user_message)])
         
-        agent_response = ""
-        sql_query = None
-        query_result = None
-        tool_call_count = 0
-
-        async for event in runner.run_async(
-            user_id=session.user_id,
-            session_id=session.id,
-            new_message=message,
-        ):
-            event_type = getattr(event, '__class__', type(event)).__name__
-
-            if hasattr(event, 'content') and event.content:
-                content = event.content
-                role = getattr(content, 'role', None)
-
-                if hasattr(content, 'parts') and content.parts:
-                    for part_idx, part in enumerate(content.parts):
-                        # 사고 과정
-                        if hasattr(part, 'thought'):
-                            yield f"event: thought\ndata: {json.dumps({'thought': str(part.thought)}, ensure_ascii=False)}\n\n"
-
-                        # 텍스트 응답
-                        if hasattr(part, 'text') and part.text:
-                            agent_response += part.text
-                            yield f"event: thinking\ndata: {json.dumps({'text': part.text, 'cumulative_length': len(agent_response)}, ensure_ascii=False)}\n\n"
-
-                        # 도구 호출
-                        if hasattr(part, 'function_call') and role == 'model':
-                            fc = part.function_call
-                            tool_name = getattr(fc, 'name', 'unknown')
-                            tool_args = getattr(fc, 'args', {})
+            # 조각을 모아 마지막에 한 번만 합치고, 누적 길이는 별도 카운터로 유지
+            agent_response_parts: List[str] = []
+            agent_response_length = 0
+            sql_query = None
+            query_result = None
+            tool_call_count = 0
+
+            async for event in runner.run_async(
+                user_id=session.user_id,
+                session_id=session.id,
+                new_message=message,
+            ):
+                if hasattr(event, 'content') and event.content:
+                    content = event.content
+                    role = getattr(content, 'role', None)
+
+                    if hasattr(content, 'parts') and content.parts:
+                        for part_idx, part in enumerate(content.parts):
+                            # 사고 과정
+                            if hasattr(part, 'thought'):
+                                yield {"event": "thought", "data": {"thought": str(part.thought)}}
+
+                            # 텍스트 응답
+                            if hasattr(part, 'text') and part.text:
+                                agent_response_parts.append(part.text)
+                                agent_response_length += len(part.text)
+                                yield {
+                                    "event": "thinking",
+                                    "data": {"text": part.text, "cumulative_length": agent_response_length},
+                                }
+
+                            # 도구 호출
+                            if hasattr(part, 'function_call') and role == 'model':
+                                fc = part.function_call
+                                tool_name = getattr(fc, 'name', 'unknown')
+                                tool_args = getattr(fc, 'args', {})
                             
-                            if tool_name != 'unknown':
-                                tool_call_count += 1
-                                if 'bigquery' in tool_name and 'sql' in tool_args:
-                                    sql_query = tool_args['sql']
-                                    yield f"event: sql\ndata: {json.dumps({'sql': sql_query, 'tool': tool_name}, ensure_ascii=False)}\n\n"
+                                if tool_name != 'unknown':
+                                    tool_call_count += 1
+                                    if tool_name.startswith(_BQ_TOOL_PREFIXES) and 'sql' in tool_args:
+                                        sql_query = tool_args['sql']
+                                        yield {"event": "sql", "data": {"sql": sql_query, "tool": tool_name}}
                                 
-                                yield f"event: tool_call\ndata: {json.dumps({'tool_name': tool_name, 'args': tool_args, 'order': tool_call_count}, ensure_ascii=False)}\n\n"
-
-                        # 도구 응답 감지
-                        if hasattr(part, 'function_response'):
-                            fr = part.function_response
-                            response_data = None
-
-                            if hasattr(fr, 'response'):
-                                response_data = fr.response
-                                if isinstance(response_data, str):
-                                    try:
-                                        response_data = json.loads(response_data)
-                                    except json.JSONDecodeError:
-                                        pass
-                            elif isinstance(fr, dict):
-                                response_data = fr
-                            elif isinstance(fr, str):
-                                try:
-                                    response_data = json.loads(fr)
-                                except Exception:
-                                    response_data = fr
-
-                            if response_data:
-                                if isinstance(response_data, dict):
-                                    if 'result' in response_data and isinstance(response_data['result'], str):
-                                        try:
-                                            response_data = json.loads(response_data['result'])
-                                        except json.JSONDecodeError:
-                                            pass
-
-                                if isinstance(response_data, dict) and 'rows' in response_data:
-                                    query_result = response_data['rows']
-                                    row_count = len(query_result) if isinstance(query_result, list) else 0
-                                    preview = query_result[:3] if isinstance(query_result, list) else None
-
-                                    yield f"event: result\ndata: {json.dumps({'row_count': row_count, 'preview': preview}, ensure_ascii=False)}\n\n"
-
-            await asyncio.sleep(0.01)
+                                    yield {
+                                        "event": "tool_call",
+                                        "data": {"tool_name": tool_name, "args": tool_args, "order": tool_call_count},
+                                    }
+
+                            # 도구 응답 감지
+                            if hasattr(part, 'function_response'):
+                                fr = part.function_response
+                                response_data, _ = coerce_tool_response(fr)
+
+                                if response_data:
+                                    if isinstance(response_data, dict):
+                                        if 'result' in response_data and isinstance(response_data['result'], str):
+                                            try:
+                                                response_data = orjson.loads(response_data['result'])
+                                            except orjson.JSONDecodeError:
+                                                pass
+
+                                    if isinstance(response_data, dict) and 'rows' in response_data:
+                                        query_result = response_data['rows']
+                                        row_count = len(query_result) if isinstance(query_result, list) else 0
+                                        preview = query_result[:3] if isinstance(query_result, list) else None
+
+                                        yield {"event": "result", "data": {"row_count": row_count, "preview": preview}}
 
         # 응답 완료 및 종료
-        yield f"event: response\ndata: {json.dumps({'response': agent_response.strip(), 'length': len(agent_response)}, ensure_ascii=False)}\n\n"
+        agent_response = "".join(agent_response_parts)
+        yield {
+            "event": "response",
+            "data": {"response": agent_response.strip(), "length": len(agent_response)},
+        }
         
         done_payload = {
             "tool_calls": tool_call_count,
@@ -357,8 +380,8 @@ async def stream_adk_events_service(
             "result_rows": len(query_result) if query_result else 0,
             "mode": agent_mode,
         }
-        yield f"event: done\ndata: {json.dumps(done_payload, ensure_ascii=False)}\n\n"
+        yield {"event": "done", "data": done_payload}
 
     except Exception as e:
-        logger.error(f"❌ [SSE 서비스] 에러: {e}")
-        yield f"event: error\ndata: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
+        logger.error("❌ [SSE 서비스] 에러: %s", e)
+        yield {"event": "error", "data": {"error": str(e)}}
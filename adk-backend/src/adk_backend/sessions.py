@@ -1,23 +1,67 @@
 from __future__ import annotations
 
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 
 from .workflows.divorce import APP_NAME, get_runner
 
+# 최근 확인한 세션 캐시 (같은 세션으로 반복 요청 시 세션 서비스 조회 생략)
+SESSION_CACHE_TTL = 300.0
+SESSION_CACHE_SIZE = 256
+
+_session_cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+
+
+def _remember(session: Any) -> Any:
+    key = (session.user_id, session.id)
+    _session_cache[key] = (time.monotonic() + SESSION_CACHE_TTL, session)
+    _session_cache.move_to_end(key)
+    if len(_session_cache) > SESSION_CACHE_SIZE:
+        _session_cache.popitem(last=False)
+    return session
+
+
+def _may_exist(session_service: Any, user_id: str, session_id: str) -> bool:
+    """세션이 이미 있을 수 있으면 True (아니면 조회 없이 바로 생성)
+
+    InMemorySessionService는 세션 맵을 그대로 들고 있으므로 get_session(세션 deepcopy) 없이
+    존재 여부를 확인함 (create_session은 같은 ID를 덮어쓰므로 있는 세션은 조회 경로 유지).
+    맵이 없는 다른 세션 서비스는 항상 조회함.
+    """
+    sessions = getattr(session_service, "sessions", None)
+    if not isinstance(sessions, dict):
+        return True
+    return session_id in sessions.get(APP_NAME, {}).get(user_id, {})
+
 
 async def ensure_session(user_id: Optional[str], session_id: Optional[str]):
-    """Ensure an ADK session exists and return it."""
-    runner = get_runner()
+    """Ensure an ADK session exists and return it.
+
+    Recently resolved sessions are served from a small TTL cache, so callers
+    should only rely on ``id``/``user_id`` of the returned session.
+    """
     resolved_user = user_id or "web-user"
     if session_id:
+        key = (resolved_user, session_id)
+        cached = _session_cache.get(key)
+        if cached is not None:
+            expires_at, session = cached
+            if expires_at > time.monotonic():
+                _session_cache.move_to_end(key)
+                return session
+            del _session_cache[key]
+
+    runner = get_runner()
+    if session_id and _may_exist(runner.session_service, resolved_user, session_id):
         session = await runner.session_service.get_session(
             app_name=APP_NAME, user_id=resolved_user, session_id=session_id
         )
         if session:
-            return session
+            return _remember(session)
     session = await runner.session_service.create_session(
         app_name=APP_NAME,
         user_id=resolved_user,
         session_id=session_id,
     )
-    return session
+    return _remember(session)
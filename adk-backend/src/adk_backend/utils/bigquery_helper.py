@@ -1,6 +1,7 @@
 import os
 import logging
 import asyncio
+import time
 from functools import partial
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date
@@ -20,15 +21,39 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    """BigQuery Row를 JSON 직렬화 가능한 딕셔너리로 변환"""
+    row_dict = {}
+    for key, value in row.items():
+        # BigQuery 타입을 Python 타입으로 변환
+        if isinstance(value, (datetime, date)):
+            row_dict[key] = value.isoformat()
+        elif hasattr(value, 'total_seconds'):  # timedelta
+            row_dict[key] = value.total_seconds()
+        else:
+            row_dict[key] = value
+    return row_dict
+
+
 class BigQueryHelper:
     """BigQuery 연동을 위한 헬퍼 클래스"""
     
-    def __init__(self, project_id: str = None, dataset_name: str = None, credentials_path: str = None):
+    def __init__(
+        self,
+        project_id: str = None,
+        dataset_name: str = None,
+        credentials_path: str = None,
+        metadata_cache_ttl: float = 30.0,
+    ):
         self.project_id = project_id or os.getenv('GOOGLE_CLOUD_PROJECT')
         self.dataset_name = dataset_name or os.getenv('BIGQUERY_DATASET', 'analytics_sfg')
         self.credentials_path = credentials_path or os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
         self._permission_error = False
         self._last_error: Optional[str] = None
+        # 메타데이터 캐시: key -> (만료 시각(monotonic), 값)
+        self._metadata_cache_ttl = metadata_cache_ttl
+        self._metadata_cache: Dict[Any, Tuple[float, Any]] = {}
         
         if not bigquery:
             logger.warning("Google Cloud BigQuery library not installed. Install with: pip install google-cloud-bigquery")
@@ -72,8 +97,18 @@ class BigQueryHelper:
             self._last_error = str(e)
             return False
     
-    def execute_query(self, sql: str, timeout: int = 30) -> List[Dict[str, Any]]:
-        """SQL 쿼리를 실행하고 결과를 반환합니다."""
+    def execute_query(
+        self,
+        sql: str,
+        timeout: int = 30,
+        maximum_bytes_billed: Optional[int] = None,
+        max_results: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """SQL 쿼리를 실행하고 결과를 반환합니다.
+
+        maximum_bytes_billed를 지정하면 스캔량이 이를 넘는 쿼리는 BigQuery가 실행 전에 거부합니다.
+        max_results를 지정하면 쿼리는 그대로 두고 결과 행을 그 수만큼만 받아옵니다.
+        """
         if not self.client:
             raise RuntimeError("BigQuery client not initialized")
         
@@ -84,27 +119,16 @@ class BigQueryHelper:
             job_config = bigquery.QueryJobConfig()
             job_config.use_query_cache = True
             job_config.use_legacy_sql = False
+            if maximum_bytes_billed:
+                job_config.maximum_bytes_billed = maximum_bytes_billed
             
             query_job = self.client.query(sql, job_config=job_config)
             
             # 결과 대기
-            results = query_job.result(timeout=timeout)
+            results = query_job.result(timeout=timeout, max_results=max_results)
             
             # 결과를 딕셔너리 리스트로 변환
-            rows = []
-            for row in results:
-                row_dict = {}
-                for key, value in row.items():
-                    # BigQuery 타입을 Python 타입으로 변환
-                    if isinstance(value, datetime):
-                        row_dict[key] = value.isoformat()
-                    elif isinstance(value, date):
-                        row_dict[key] = value.isoformat()
-                    elif hasattr(value, 'total_seconds'):  # timedelta
-                        row_dict[key] = value.total_seconds()
-                    else:
-                        row_dict[key] = value
-                rows.append(row_dict)
+            rows = [_row_to_dict(row) for row in results]
             
             logger.info(f"Query executed successfully. Returned {len(rows)} rows.")
             return rows
@@ -125,16 +149,27 @@ class BigQueryHelper:
             self._last_error = str(e)
             raise RuntimeError(error_msg) from e
 
-    async def execute_query_async(self, sql: str, timeout: int = 30) -> List[Dict[str, Any]]:
+    async def execute_query_async(
+        self,
+        sql: str,
+        timeout: int = 30,
+        maximum_bytes_billed: Optional[int] = None,
+        max_results: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """비동기적으로 SQL 쿼리를 실행합니다."""
         loop = asyncio.get_running_loop()
-        func = partial(self.execute_query, sql, timeout)
+        func = partial(self.execute_query, sql, timeout, maximum_bytes_billed, max_results)
         return await loop.run_in_executor(None, func)
     
     def get_table_schema(self, table_name: str) -> Optional[Dict[str, Any]]:
         """테이블 스키마 정보 조회"""
         if not self.client:
             return None
+
+        cache_key = ("table_schema", table_name)
+        cached = self._get_cached_metadata(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             table_ref = self.client.dataset(self.dataset_name).table(table_name)
@@ -159,6 +194,7 @@ class BigQueryHelper:
                 }
                 schema_info["columns"].append(column_info)
             
+            self._set_cached_metadata(cache_key, schema_info)
             return schema_info
         except Forbidden as e:
             logger.error(f"Permission denied when fetching schema for {table_name}: {e}")
@@ -173,27 +209,30 @@ class BigQueryHelper:
             self._last_error = str(e)
             return None
     
-    def list_tables(self) -> List[Dict[str, Any]]:
-        """데이터셋의 모든 테이블 목록 조회"""
+    def list_tables(
+        self, raise_errors: bool = False, use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """데이터셋의 모든 테이블 목록 조회
+
+        raise_errors=True이면 실패를 빈 목록 대신 예외로 그대로 올리고 공유 오류 상태
+        (_permission_error/_last_error)를 건드리지 않습니다 (헬스체크 프로브용).
+        use_cache=False이면 메타데이터 캐시를 건너뛰고 항상 API를 호출합니다.
+        """
         if not self.client:
+            if raise_errors:
+                raise RuntimeError("BigQuery client not initialized")
             return []
+
+        if use_cache:
+            cached = self._get_cached_metadata("table_list")
+            if cached is not None:
+                return cached
+
+        if raise_errors:
+            return self._fetch_table_list()
         
         try:
-            dataset_ref = self.client.dataset(self.dataset_name)
-            tables = list(self.client.list_tables(dataset_ref))
-            
-            table_list = []
-            for table in tables:
-                table_info = {
-                    "name": table.table_id,
-                    "type": table.table_type,
-                    "created": table.created.isoformat() if table.created else None,
-                    "num_rows": getattr(table, 'num_rows', 0),
-                    "size_bytes": getattr(table, 'num_bytes', 0)
-                }
-                table_list.append(table_info)
-            
-            return table_list
+            return self._fetch_table_list()
         except Forbidden as e:
             logger.error(f"Permission denied when listing tables in dataset {self.dataset_name}: {e}")
             self._permission_error = True
@@ -204,14 +243,38 @@ class BigQueryHelper:
             self._last_error = str(e)
             return []
 
+    def _fetch_table_list(self) -> List[Dict[str, Any]]:
+        """테이블 목록을 API로 조회해 캐시에 저장 (예외는 호출 측에서 처리)"""
+        dataset_ref = self.client.dataset(self.dataset_name)
+        tables = list(self.client.list_tables(dataset_ref))
+        
+        table_list = []
+        for table in tables:
+            table_info = {
+                "name": table.table_id,
+                "type": table.table_type,
+                "created": table.created.isoformat() if table.created else None,
+                "num_rows": getattr(table, 'num_rows', 0),
+                "size_bytes": getattr(table, 'num_bytes', 0)
+            }
+            table_list.append(table_info)
+        
+        self._set_cached_metadata("table_list", table_list)
+        return table_list
+
     def get_table_info(self, table_name: str) -> Optional[Dict[str, Any]]:
         """특정 테이블의 기본 정보를 반환"""
         if not self.client:
             return None
+
+        cache_key = ("table_info", table_name)
+        cached = self._get_cached_metadata(cache_key)
+        if cached is not None:
+            return cached
         try:
             table_ref = self.client.dataset(self.dataset_name).table(table_name)
             table = self.client.get_table(table_ref)
-            return {
+            table_info = {
                 "table_id": table.table_id,
                 "full_table_id": getattr(table, "full_table_id", None),
                 "num_rows": getattr(table, "num_rows", 0),
@@ -220,6 +283,8 @@ class BigQueryHelper:
                 "modified": table.modified.isoformat() if getattr(table, "modified", None) else None,
                 "description": table.description or ""
             }
+            self._set_cached_metadata(cache_key, table_info)
+            return table_info
         except Forbidden as e:
             logger.error(f"Permission denied when accessing table {table_name}: {e}")
             self._permission_error = True
@@ -233,11 +298,74 @@ class BigQueryHelper:
             self._last_error = str(e)
             return None
     
+    def get_all_table_info(self) -> Dict[str, Dict[str, Any]]:
+        """데이터셋 전체 테이블의 기본 정보를 한 번의 쿼리로 조회 (__TABLES__ 메타 테이블)
+
+        Returns:
+            테이블 이름 -> get_table_info()와 같은 키(num_rows, num_bytes, created, modified)의 딕셔너리
+        """
+        if not self.client:
+            return {}
+
+        cached = self._get_cached_metadata("all_table_info")
+        if cached is not None:
+            return cached
+
+        sql = f"""
+        SELECT
+            table_id,
+            row_count,
+            size_bytes,
+            TIMESTAMP_MILLIS(creation_time) AS created,
+            TIMESTAMP_MILLIS(last_modified_time) AS modified
+        FROM `{self.project_id}.{self.dataset_name}.__TABLES__`
+        """
+        try:
+            rows = self.execute_query(sql)
+        except Exception as e:
+            # execute_query가 권한 오류/마지막 오류 상태를 기록함
+            logger.error(f"Failed to get table metadata for dataset {self.dataset_name}: {e}")
+            return {}
+
+        table_info = {
+            row["table_id"]: {
+                "table_id": row["table_id"],
+                "num_rows": row.get("row_count") or 0,
+                "num_bytes": row.get("size_bytes") or 0,
+                "created": row.get("created"),
+                "modified": row.get("modified"),
+            }
+            for row in rows
+        }
+        self._set_cached_metadata("all_table_info", table_info)
+        return table_info
+
+    def list_rows(self, table_name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """테이블 행을 쿼리 잡 없이 직접 조회 (tabledata.list, 과금/슬롯 사용 없음)"""
+        if not self.client:
+            raise RuntimeError("BigQuery client not initialized")
+
+        try:
+            table_ref = self.client.dataset(self.dataset_name).table(table_name)
+            rows = self.client.list_rows(table_ref, max_results=limit)
+            return [_row_to_dict(row) for row in rows]
+        except NotFound as e:
+            raise ValueError(f"Table {table_name} not found in dataset {self.dataset_name}") from e
+        except Forbidden as e:
+            self._permission_error = True
+            self._last_error = str(e)
+            error_msg = f"BigQuery permission denied: {e}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg) from e
+        except Exception as e:
+            logger.error(f"Failed to list rows for table {table_name}: {e}")
+            self._last_error = str(e)
+            raise
+
     def get_sample_data(self, table_name: str, limit: int = 10) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """테이블의 샘플 데이터 조회"""
-        sql = f"SELECT * FROM `{self.project_id}.{self.dataset_name}.{table_name}` LIMIT {limit}"
         try:
-            rows = self.execute_query(sql)
+            rows = self.list_rows(table_name, limit)
             return rows, None
         except Exception as e:
             return [], str(e)
@@ -441,6 +569,28 @@ class BigQueryHelper:
             self._last_error = str(e)
             return None
 
+    def _get_cached_metadata(self, key: Any) -> Optional[Any]:
+        entry = self._metadata_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._metadata_cache.pop(key, None)
+            return None
+        return value
+
+    def _set_cached_metadata(self, key: Any, value: Any) -> None:
+        self._metadata_cache[key] = (time.monotonic() + self._metadata_cache_ttl, value)
+
+    def invalidate_metadata_cache(self) -> None:
+        """캐시된 테이블 메타데이터를 모두 비움 (테이블 생성/변경 직후 등)"""
+        self._metadata_cache.clear()
+
+    def reset_error_state(self) -> None:
+        """요청 단위 오류 상태 초기화 (싱글톤 재사용 시 이전 요청의 오류가 남지 않도록)"""
+        self._permission_error = False
+        self._last_error = None
+
     @property
     def permission_error(self) -> bool:
         return self._permission_error
@@ -449,6 +599,12 @@ class BigQueryHelper:
     def last_error(self) -> Optional[str]:
         return self._last_error
 
+    def close(self) -> None:
+        """BigQuery 클라이언트의 HTTP 연결 풀 정리"""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
 # 전역 BigQuery 헬퍼 인스턴스
 _bigquery_helper = None
 
@@ -458,3 +614,10 @@ def get_bigquery_helper() -> BigQueryHelper:
     if _bigquery_helper is None:
         _bigquery_helper = BigQueryHelper()
     return _bigquery_helper
+
+def close_bigquery_helper() -> None:
+    """싱글톤이 생성된 경우에만 연결을 정리 (앱 종료 시 호출)"""
+    global _bigquery_helper
+    if _bigquery_helper is not None:
+        _bigquery_helper.close()
+        _bigquery_helper = None
@@ -0,0 +1,73 @@
+"""
+백그라운드 CPU 사용률 샘플러
+
+psutil.cpu_percent(interval=1)처럼 요청마다 1초씩 블로킹하지 않도록
+주기적으로 non-blocking 샘플을 링 버퍼에 쌓아두고 엔드포인트는 스냅샷만 읽습니다.
+"""
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 링 버퍼 크기는 2의 거듭제곱이어야 함 (인덱스를 비트 마스크로 순환)
+RING_SIZE = 16
+_RING_MASK = RING_SIZE - 1
+
+
+class CpuSampler:
+    """최근 RING_SIZE개의 시스템 CPU 사용률 샘플을 보관"""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self._ring: List[float] = [0.0] * RING_SIZE
+        self._count = 0
+        self._task: Optional[asyncio.Task] = None
+        self._cpu_percent: Optional[Callable[..., float]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """샘플링 태스크 시작 (실행 중인 이벤트 루프 필요)"""
+        if self.running:
+            return
+        # psutil은 샘플러를 실제로 시작할 때 로드
+        import psutil
+        self._cpu_percent = psutil.cpu_percent
+        # 첫 호출은 기준점만 잡고 0.0을 반환하므로 버림
+        self._cpu_percent(interval=None)
+        self._task = asyncio.create_task(self._run(), name="cpu-sampler")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._ring[self._count & _RING_MASK] = self._cpu_percent(interval=None)
+            self._count += 1
+
+    def snapshot(self) -> Optional[Dict[str, float]]:
+        """최신 값과 윈도우 min/avg/max (샘플이 없으면 None)"""
+        count = self._count
+        if count == 0:
+            return None
+        window = self._ring if count >= RING_SIZE else self._ring[:count]
+        return {
+            "current": self._ring[(count - 1) & _RING_MASK],
+            "min": min(window),
+            "avg": round(sum(window) / len(window), 2),
+            "max": max(window),
+        }
+
+
+cpu_sampler = CpuSampler()
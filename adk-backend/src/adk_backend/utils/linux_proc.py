@@ -0,0 +1,49 @@
+"""
+Linux /proc 직접 읽기 헬퍼
+
+헬스체크처럼 자주 호출되는 경로에서 psutil.virtual_memory()의 여러 파일 읽기와
+namedtuple 생성을 피하기 위해 /proc/meminfo를 한 번의 pread로 읽어 필요한 값만 파싱합니다.
+Linux 이외의 환경에서는 IS_LINUX가 False이며 호출 측에서 psutil로 대체해야 합니다.
+"""
+import os
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+
+IS_LINUX = sys.platform == "linux"
+
+_MEMINFO_PATH = "/proc/meminfo"
+_READ_SIZE = 8192
+
+_meminfo_fd: Optional[int] = None
+_fd_lock = threading.Lock()
+
+
+def _get_meminfo_fd() -> int:
+    """/proc/meminfo fd를 한 번만 열어 재사용 (pread는 offset 0부터 매번 새 내용을 반환)"""
+    global _meminfo_fd
+    if _meminfo_fd is None:
+        with _fd_lock:
+            if _meminfo_fd is None:
+                _meminfo_fd = os.open(_MEMINFO_PATH, os.O_RDONLY)
+    return _meminfo_fd
+
+
+def read_meminfo(keys: Tuple[bytes, ...] = (b"MemTotal", b"MemAvailable")) -> Dict[str, int]:
+    """/proc/meminfo에서 지정한 항목을 바이트 단위로 반환
+
+    Returns:
+        {"MemTotal": ..., "MemAvailable": ...} 형태의 딕셔너리 (없는 항목은 생략)
+    """
+    data = os.pread(_get_meminfo_fd(), _READ_SIZE, 0)
+    values: Dict[str, int] = {}
+    for key in keys:
+        start = data.find(key + b":")
+        if start < 0:
+            continue
+        end = data.find(b"\n", start)
+        # 형식: "MemTotal:       16318412 kB"
+        fields = data[start + len(key) + 1:end if end >= 0 else None].split()
+        if fields:
+            values[key.decode()] = int(fields[0]) * 1024
+    return values
@@ -10,7 +10,7 @@ from ..agents import divorce_case_agent
 APP_NAME = "Unified Divorce Intelligence Platform"
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_runner() -> InMemoryRunner:
     """Create a singleton InMemoryRunner for the application."""
     return InMemoryRunner(app_name=APP_NAME, agent=divorce_case_agent)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "test-project")
+
+from adk_backend.api.data import _is_select
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT 1",
+        "  \n\tselect * FROM t",
+        "-- 설명\nSELECT 1",
+        "/* 블록 주석 */ SELECT 1",
+        "-- a\n/* b\n c */\n  Select(1)",
+    ],
+)
+def test_is_select_accepts_select_queries(sql: str) -> None:
+    assert _is_select(sql)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "",
+        "   ",
+        "DELETE FROM t",
+        "DROP TABLE t",
+        "-- SELECT\nDROP TABLE t",
+        "/* SELECT */ DELETE FROM t",
+        "/* 닫히지 않은 주석 SELECT 1",
+        "-- 줄바꿈 없는 주석 SELECT 1",
+        "SELECTED_ROWS",
+    ],
+)
+def test_is_select_rejects_non_select_queries(sql: str) -> None:
+    assert not _is_select(sql)
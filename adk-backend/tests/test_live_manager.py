@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import os
 from types import SimpleNamespace
 from typing import Any, AsyncIterator, Dict, List
@@ -12,14 +13,32 @@ os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "test-project")
 pytest.importorskip("google.adk")
 
 from adk_backend import live
-from adk_backend.live import LiveRunManager, format_sse_message
+from adk_backend.live import LiveRunManager, coalesce_sse_frames, format_sse_message
+
+
+def parse_sse_frames(chunk: bytes) -> List[Dict[str, Any]]:
+    messages: List[Dict[str, Any]] = []
+    for block in chunk.decode().split("\n\n"):
+        if not block:
+            continue
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        messages.append(
+            {
+                "id": int(fields["id"]) if "id" in fields else None,
+                "event": fields["event"],
+                "data": json.loads(fields["data"]),
+            }
+        )
+    return messages
 
 
 class FakeEvent:
     def __init__(self, content: Dict[str, Any]):
         self._content = content
 
-    def model_dump(self, *, by_alias: bool = False, exclude_none: bool = False) -> Dict[str, Any]:
+    def model_dump(
+        self, *, mode: str = "python", by_alias: bool = False, exclude_none: bool = False
+    ) -> Dict[str, Any]:
         return dict(self._content)
 
 
@@ -61,13 +80,16 @@ async def test_live_run_manager_streams_events(monkeypatch: pytest.MonkeyPatch)
 
     received: List[Dict[str, Any]] = []
     try:
-        while True:
-            message = await asyncio.wait_for(queue.get(), timeout=1.0)
-            received.append(message)
-            if message.get("event") == "run.status" and (
-                message.get("data") or {}
-            ).get("status") in {"completed", "error"}:
-                break
+        done = False
+        while not done:
+            chunk = await asyncio.wait_for(queue.get(), timeout=1.0)
+            assert isinstance(chunk, bytes)
+            for message in parse_sse_frames(chunk):
+                received.append(message)
+                if message.get("event") == "run.status" and (
+                    message.get("data") or {}
+                ).get("status") in {"completed", "error"}:
+                    done = True
     finally:
         await manager.unsubscribe(run_id, queue)
         await manager.ensure_task_done(run_id)
@@ -93,6 +115,21 @@ def test_format_sse_message_structure() -> None:
         "data": {"foo": "bar"},
     }
     sse = format_sse_message(message)
+    assert isinstance(sse, bytes)
+    sse = sse.decode()
     assert "id: 1" in sse
     assert "event: adk.event" in sse
-    assert 'data: {"foo": "bar"}' in sse
+    assert 'data: {"foo":"bar"}' in sse
+
+
+@pytest.mark.asyncio
+async def test_coalesce_sse_frames_batches_in_order() -> None:
+    async def messages() -> AsyncIterator[Dict[str, Any]]:
+        for index in range(20):
+            yield {"event": "thought", "data": {"index": index}}
+
+    chunks = [chunk async for chunk in coalesce_sse_frames(messages(), max_events=8)]
+
+    assert len(chunks) == 3
+    received = [message for chunk in chunks for message in parse_sse_frames(chunk)]
+    assert [message["data"]["index"] for message in received] == list(range(20))
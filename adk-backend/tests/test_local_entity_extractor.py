@@ -0,0 +1,46 @@
+"""
+로컬 엔티티 추출기 테스트
+
+정규식/사전으로 확정 가능한 질의만 로컬에서 처리하고 나머지는 None을 반환하는지 확인
+"""
+from __future__ import annotations
+
+from adk_backend.nlp.local_entity_extractor import extract_entities
+
+
+def test_extracts_prompt_example():
+    """추출 프롬프트 예시와 같은 결과"""
+    assert extract_entities("상간녀 소송 시 위자료는 보통 얼마나 나오나요?") == {
+        "table": "precedent_cases",
+        "fault_type": "부정행위",
+        "aggregation": "AVG_ALIMONY",
+    }
+
+
+def test_extracts_ranges_and_periods():
+    """위자료 범위와 분석 기간 추출"""
+    entities = extract_entities("2023년 이후 고부 갈등으로 위자료 2000만원 이상 받은 판례는 몇 건인가요?")
+
+    assert entities == {
+        "table": "precedent_cases",
+        "fault_type": "고부갈등",
+        "aggregation": "COUNT",
+        "alimony_range": "2000만원 이상",
+        "time_period": "2023년 이후",
+    }
+
+
+def test_recent_period():
+    """'최근 N년' 형태의 기간"""
+    entities = extract_entities("최근 3년간 외도 판례의 재산분할 비율")
+
+    assert entities is not None
+    assert entities["time_period"] == "최근 3년"
+    assert entities["aggregation"] == "AVG_PROPERTY_RATIO"
+    assert entities["property_ratio"] == "재산분할"
+
+
+def test_ambiguous_query_falls_back():
+    """유책 사유나 집계 함수를 확정할 수 없으면 None"""
+    assert extract_entities("재산분할 비율은 보통 어떻게 정해지나요?") is None
+    assert extract_entities("부정행위로 이혼하려면 어떻게 해야 하나요?") is None